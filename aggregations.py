@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""Derived tables computed once per snapshot version.
+
+Each aggregation is cached with the signature of the tables it is computed
+from, so it is rebuilt only when the snapshot changes. Selections in the
+dashboard then become lookups instead of filtering and grouping the raw
+tables on every rerun. The aggregations are shared across sessions; like the
+snapshot tables, the frames are returned as lazy (copy-on-write) copies.
+"""
+import pandas as pd
+import streamlit as st
+
+import artifacts
+import snapshot
+
+# Tables linking capabilities (assays, software, target classes) to partners
+CAPABILITY_TABLES = ("assay_data", "software_data", "target_data")
+
+# Short axis labels for skill groups; other groups just drop the " Group" suffix
+SKILL_GROUP_LABELS = {
+    "Communication and Project Management Group": "Communication",
+}
+
+
+@st.cache_resource(show_spinner=False, max_entries=2 * len(CAPABILITY_TABLES))
+def _capability_index(name: str, path: str, signature: tuple) -> dict:
+    baked = artifacts.lookup(("capability_index", name), [name])
+    if baked is not None:
+        return baked
+
+    df = snapshot.load_table(name)
+    counts = df.groupby(["Name", "Partner"])["info"].count().reset_index()
+    counts["Percentage"] = round(
+        counts["info"] / counts.groupby("Name")["info"].transform("sum") * 100, 2
+    )
+    return {
+        capability: frame.drop(columns="Name").reset_index(drop=True)
+        for capability, frame in counts.groupby("Name", sort=False)
+    }
+
+
+def get_capability_index(name: str) -> dict:
+    """Get the partner distribution of every capability in a table.
+
+    Maps each capability name to a frame with the columns Partner, info (number
+    of individuals) and Percentage (share of the individuals).
+    """
+    assert name in CAPABILITY_TABLES, "Invalid capability table"
+    return _capability_index(name, *snapshot.table_signature(name))
+
+
+def get_capability_partners(name: str, capability: str) -> pd.DataFrame:
+    """Get the partner distribution of a single capability."""
+    index = get_capability_index(name)
+    if capability not in index:
+        return pd.DataFrame(columns=["Partner", "info", "Percentage"])
+    return index[capability].copy(deep=False)
+
+
+def skill_group_label(group: str) -> str:
+    """Get the short label of a skill group."""
+    return SKILL_GROUP_LABELS.get(group, group.removesuffix(" Group"))
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _skill_group_matrix(skills_info_version: tuple, skillgroups_version: tuple):
+    baked = artifacts.lookup(("skill_group_matrix",), ["skills_info", "skillgroups"])
+    if baked is not None:
+        return baked
+
+    skills_info = snapshot.get_skills_info()
+    groups = list(snapshot.get_skill_groups()["SkillGroup"].dropna())
+    groups += [g for g in skills_info["Group"].dropna().unique() if g not in groups]
+
+    matrix = pd.crosstab(skills_info["Individual"], skills_info["Group"])
+    matrix = matrix.reindex(columns=groups, fill_value=0)
+    matrix.columns = [skill_group_label(group) for group in matrix.columns]
+    matrix = matrix.T.groupby(level=0).sum().T  # merge groups with the same label
+    matrix.index.name, matrix.columns.name = "individual", "skill"
+    return matrix
+
+
+def get_skill_group_matrix() -> pd.DataFrame:
+    """Get the number of skills of each individual (rows) per skill group (columns)."""
+    return _skill_group_matrix(
+        snapshot.table_signature("skills_info"),
+        snapshot.table_signature("skillgroups"),
+    ).copy(deep=False)
+
+
+def _surname_key(name: str) -> str:
+    # Individuals are sorted by their second name, single names come first
+    parts = name.split()
+    return parts[1].lower() if len(parts) > 1 else ""
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _sop_participants(standard_operations_version: tuple) -> pd.DataFrame:
+    baked = artifacts.lookup(("sop_participants",), ["standard_operations"])
+    if baked is not None:
+        return baked
+
+    # Row is the position of the SOG/P in the table; IDs may repeat
+    sops = snapshot.get_standard_operations().reset_index(drop=True)
+    sops.index.name = "Row"
+    participants = sops.reset_index().melt(
+        id_vars=["Row", "ID", "Category"],
+        value_vars=["Creator", "Reviewer"],
+        var_name="Role",
+        value_name="Name",
+    )
+    participants = participants.dropna(subset=["Name"])
+    participants["Name"] = participants["Name"].astype(str).str.split(",")
+    participants = participants.explode("Name")
+    participants["Name"] = participants["Name"].str.strip()
+    return participants[participants["Name"] != ""].reset_index(drop=True)
+
+
+def get_sop_participants() -> pd.DataFrame:
+    """Get one row per SOG/P, role (Creator or Reviewer) and individual.
+
+    Row is the position of the SOG/P in the standard operations table.
+    """
+    return _sop_participants(snapshot.table_signature("standard_operations")).copy(
+        deep=False
+    )
+
+
+def get_sop_participant_names(role: str) -> list:
+    """Get the sorted names of all individuals with the given role."""
+    participants = get_sop_participants()
+    return sorted(participants.loc[participants["Role"] == role, "Name"].unique())
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _sop_expertise_matrix(
+    standard_operations_version: tuple, so_categories_version: tuple
+) -> pd.DataFrame:
+    baked = artifacts.lookup(
+        ("sop_expertise_matrix",), ["standard_operations", "so_categories"]
+    )
+    if baked is not None:
+        return baked
+
+    participants = get_sop_participants()
+    categories = list(snapshot.get_so_categories()["Category"])
+    categories += [
+        c for c in participants["Category"].dropna().unique() if c not in categories
+    ]
+
+    # Creators reviewing their own SOG/P count once
+    unique = participants.drop_duplicates(subset=["Row", "Name"])
+    matrix = pd.crosstab(unique["Name"], unique["Category"])
+
+    names = sorted(participants["Name"].unique())
+    order = sorted(names, key=_surname_key)
+    return matrix.reindex(index=order, columns=categories, fill_value=0)
+
+
+def get_sop_expertise_matrix() -> pd.DataFrame:
+    """Get the number of SOG/Ps each individual (rows) worked on per category.
+
+    Rows are sorted by the second name of the individuals.
+    """
+    return _sop_expertise_matrix(
+        snapshot.table_signature("standard_operations"),
+        snapshot.table_signature("so_categories"),
+    ).copy(deep=False)
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""Bundle of derived tables and default figures baked ahead of time.
+
+Baking computes the aggregations, search indexes and figures of the default
+selections (and pre-renders the word clouds), and writes them to a versioned
+bundle in the cache directory. This is done while building the Docker image or
+after an export, so a new instance serves its first visitors from the bundle
+instead of computing everything on their requests:
+
+    python artifacts.py          # bake the bundle of the current snapshot
+    python artifacts.py --check  # readiness check (exit code 1 if not ready)
+
+When a server has loaded the bundle, it writes a marker file that the readiness
+check (readiness.py) looks for; serve.py loads the bundle when the server starts
+and again whenever it is re-baked (see keep_loaded).
+
+Every entry of the bundle records the content hashes of the tables it was
+computed from and is only used while these tables are unchanged; other entries
+of an outdated bundle stay valid. The cached builders (see aggregations.py,
+figures.py and search.py) look up the bundle before computing.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sys
+import threading
+from datetime import datetime
+
+import streamlit as st
+
+import readiness
+import snapshot
+from readiness import BUNDLE_DIR, LOADED_PATH, MANIFEST_PATH
+
+# Interval (in seconds) at which serve.py checks whether the bundle was re-baked
+BUNDLE_POLL = float(os.environ.get("KG_BUNDLE_POLL", "5"))
+
+logger = logging.getLogger(__name__)
+
+
+def input_hashes(tables) -> tuple:
+    """Get the content hashes of the tables an artifact is computed from."""
+    return tuple(snapshot.table_hash(table) for table in tables)
+
+
+def snapshot_version() -> str:
+    """Get a short content hash of all tables in the snapshot."""
+    tables = [
+        name for name in snapshot.TABLES if os.path.exists(snapshot.table_path(name))
+    ]
+    key = "\n".join(f"{name} {snapshot.table_hash(name)}" for name in tables)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def artifact_builders() -> dict:
+    """Get the artifacts to bake: key -> (tables it depends on, builder)."""
+    # Imported here, these modules look up the bundle themselves
+    import aggregations
+    import figures
+    import search
+
+    builders = {
+        ("skill_group_matrix",): (
+            ["skills_info", "skillgroups"],
+            aggregations.get_skill_group_matrix,
+        ),
+        ("sop_participants",): (
+            ["standard_operations"],
+            aggregations.get_sop_participants,
+        ),
+        ("sop_expertise_matrix",): (
+            ["standard_operations", "so_categories"],
+            aggregations.get_sop_expertise_matrix,
+        ),
+        ("sop_index",): (["standard_operations"], search.get_sop_index),
+        ("entity_index",): (
+            [table for table, _, _ in search.ENTITY_TYPES.values()],
+            search.get_entity_index,
+        ),
+    }
+    for name in aggregations.CAPABILITY_TABLES:
+        builders[("capability_index", name)] = (
+            [name],
+            lambda name=name: aggregations.get_capability_index(name),
+        )
+    for figure_id, selection in figures.default_selections():
+        builders[("figure", figure_id, selection)] = (
+            figures.FIGURES[figure_id][1],
+            lambda figure_id=figure_id, selection=selection: figures.get_figure(
+                figure_id, *selection
+            ),
+        )
+    return builders
+
+
+def bake() -> dict:
+    """Compute all artifacts of the current snapshot and write the bundle."""
+    import wordclouds
+
+    entries = {
+        key: (input_hashes(tables), build())
+        for key, (tables, build) in artifact_builders().items()
+    }
+    for partner in snapshot.get_partner_info()["Name"]:
+        wordclouds.get_partner_wordcloud(partner)
+
+    version = snapshot_version()
+    manifest = {
+        "version": version,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "bundle": f"bundle-{version}.pkl",
+        "entries": len(entries),
+    }
+    os.makedirs(BUNDLE_DIR, exist_ok=True)
+    bundle_path = os.path.join(BUNDLE_DIR, manifest["bundle"])
+    with open(f"{bundle_path}.tmp", "wb") as f:
+        pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(f"{bundle_path}.tmp", bundle_path)
+    with open(f"{MANIFEST_PATH}.tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f"{MANIFEST_PATH}.tmp", MANIFEST_PATH)
+
+    # Keep only the latest bundle
+    for file_name in os.listdir(BUNDLE_DIR):
+        if file_name.startswith("bundle-") and file_name != manifest["bundle"]:
+            os.remove(os.path.join(BUNDLE_DIR, file_name))
+    return manifest
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_bundle(manifest_path: str, signature: tuple) -> tuple:
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    with open(
+        os.path.join(os.path.dirname(manifest_path), manifest["bundle"]), "rb"
+    ) as f:
+        entries = pickle.load(f)
+    _mark_loaded(manifest)
+    return manifest, entries
+
+
+def _mark_loaded(manifest: dict):
+    # Tell the readiness check which bundle this server has loaded and whether
+    # it was baked from the snapshot that is served. A published snapshot (see
+    # hot_reload.py) is newer than the bake by design, so it is not compared.
+    marker = {
+        "version": manifest["version"],
+        "snapshot": None if snapshot.current else snapshot_version(),
+        "pid": os.getpid(),
+        "loaded": datetime.now().isoformat(timespec="seconds"),
+    }
+    try:
+        with open(f"{LOADED_PATH}.tmp", "w") as f:
+            json.dump(marker, f, indent=2)
+        os.replace(f"{LOADED_PATH}.tmp", LOADED_PATH)
+    except OSError as e:
+        logger.warning(f"Cannot write {LOADED_PATH}: {e}")
+
+
+def load_bundle() -> tuple:
+    """Get the manifest and entries of the baked bundle, empty if there is none."""
+    try:
+        return _load_bundle(MANIFEST_PATH, snapshot.file_signature(MANIFEST_PATH))
+    except (OSError, ValueError, pickle.UnpicklingError):
+        return {}, {}
+
+
+def keep_loaded(interval: float = BUNDLE_POLL, stop: threading.Event = None):
+    """Load the bundle, and load it again whenever its manifest changes.
+
+    Sessions only load a re-baked bundle when they look up an artifact, and a
+    server that failed its readiness check gets no sessions, so the server
+    process checks the manifest every `interval` seconds until `stop` is set.
+    """
+    stop = stop or threading.Event()
+    while True:
+        load_bundle()
+        if stop.wait(interval):
+            return
+
+
+def lookup(key: tuple, tables):
+    """Get a baked artifact, None if it is missing or its tables changed."""
+    _, entries = load_bundle()
+    if key not in entries:
+        return None
+    hashes, value = entries[key]
+    return value if hashes == input_hashes(tables) else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bake the dashboard artifacts")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Check that the server has loaded the bundle instead (see readiness.py)",
+    )
+    parser.add_argument(
+        "--url",
+        default=None,
+        help="Health endpoint of the dashboard to include in the check "
+        "(e.g. http://localhost:8501/_stcore/health)",
+    )
+    args = parser.parse_args()
+
+    if args.check:
+        problems = readiness.check(args.url)
+        for problem in problems:
+            print(problem)
+        sys.exit(1 if problems else 0)
+
+    manifest = bake()
+    print(
+        f"Baked {manifest['entries']} artifacts of snapshot {manifest['version']} "
+        f"to {BUNDLE_DIR}"
+    )
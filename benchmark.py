@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""Headless benchmark of the dashboard render path on synthetic snapshots.
+
+For every scale factor, a synthetic snapshot is generated (see
+synthetic_data.py) and the data preparation and figure construction of each
+dashboard section are timed without a browser. Figures are built with the
+builders of figures.py, which prepare their own data, so for these sections
+the preparation only covers reading the selection. The figures are serialized
+like st.plotly_chart does, so the time includes building the JSON sent to the
+client. Each section is timed once with empty caches (cold) and then `--runs`
+times with warm caches (median). The results are written as JSON, and can be
+compared with the report of an earlier run:
+
+    python benchmark.py --scales 1 10 100 --output benchmark.json
+    python benchmark.py --scales 1 10 100 --baseline benchmark.json
+"""
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+import plotly
+import streamlit as st
+
+import aggregations
+import figures
+import search
+import snapshot
+import synthetic_data
+import wordclouds
+
+
+def _first(values):
+    return list(values)[0]
+
+
+def figure_section(figure_id: str, selection=tuple):
+    """Section building a figure of figures.py for the selection of `selection`.
+
+    The builder is called directly, bypassing the figure cache and the baked
+    bundle, and prepares its own data.
+    """
+    builder, _ = figures.FIGURES[figure_id]
+    return selection, lambda args: builder(*args)
+
+
+def partner_wordcloud():
+    partner = _first(snapshot.get_partner_info()["Name"])
+    persons = snapshot.get_person_info()
+    return partner, persons[persons["Partner"] == partner].shape[0]
+
+
+def partner_wordcloud_image(data):
+    partner, _ = data
+    return wordclouds.get_partner_wordcloud(partner)
+
+
+def sop_search():
+    so_data = snapshot.get_standard_operations()
+    keywords = sorted(
+        set(kw.strip() for kws in so_data["Keywords"].dropna() for kw in kws.split(","))
+    )
+    return (
+        keywords,
+        search.get_sop_index().search("data"),
+        aggregations.get_sop_participant_names("Creator"),
+        aggregations.get_sop_participant_names("Reviewer"),
+    )
+
+
+def global_search():
+    return search.search_entities("plate")
+
+
+# Section name -> (data preparation, figure construction or None). The first
+# option of every selectbox is selected, like when the dashboard is opened.
+SECTIONS = {
+    "project.map": figure_section("partner_map"),
+    "project.wp": figure_section("wp_pie"),
+    "project.organizations": figure_section("organizations_pie"),
+    "project.kg_stats": figure_section("node_stats_bar"),
+    "drug_discovery.skill_groups": figure_section(
+        "skill_group_pie",
+        lambda: (_first(snapshot.get_skill_groups()["SkillGroup"]),),
+    ),
+    "drug_discovery.skill_stakeholders": figure_section(
+        "skill_heatmap", lambda: (_first(snapshot.get_skills_metadata()["Skill"]),)
+    ),
+    "drug_discovery.assays": figure_section(
+        "capability_pie",
+        lambda: ("assay_data", _first(snapshot.get_assays()["Assay"])),
+    ),
+    "drug_discovery.software": figure_section(
+        "capability_pie",
+        lambda: ("software_data", _first(snapshot.get_software()["Software"])),
+    ),
+    "drug_discovery.target_classes": figure_section(
+        "capability_pie",
+        lambda: ("target_data", _first(snapshot.get_target_classes()["Target"])),
+    ),
+    "drug_discovery.partner_wordcloud": (partner_wordcloud, partner_wordcloud_image),
+    "clinical.expertise": figure_section(
+        "clinical_heatmap",
+        lambda: (_first(snapshot.get_clinical_expertise_info()["Services"]),),
+    ),
+    "sop.categories": figure_section("soc_bar"),
+    "sop.expertise": figure_section("sop_expertise_heatmap"),
+    "sop.search": (sop_search, None),
+    "search.entities": (global_search, None),
+}
+
+
+def time_section(prep, build) -> tuple:
+    """Time the data preparation and the figure construction of a section."""
+    start = time.perf_counter()
+    data = prep()
+    prep_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if build is not None:
+        figure = build(data)
+        if isinstance(figure, plotly.graph_objs.Figure):
+            figure.to_json()
+    return prep_time, time.perf_counter() - start
+
+
+def run_scale(scale: float, runs: int, seed: int = 0) -> dict:
+    """Benchmark all sections on a synthetic snapshot of the given scale."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        rows = synthetic_data.write_snapshot(
+            synthetic_data.generate(scale, seed), f"{tmp_dir}/data"
+        )
+        data_dir, cache_dir = snapshot.DATA_DIR, wordclouds.CACHE_DIR
+        snapshot.DATA_DIR, wordclouds.CACHE_DIR = f"{tmp_dir}/data", f"{tmp_dir}/cache"
+        st.cache_resource.clear()
+        st.cache_data.clear()
+        try:
+            sections = {}
+            for name, (prep, build) in SECTIONS.items():
+                prep_cold, build_cold = time_section(prep, build)
+                warm = [time_section(prep, build) for _ in range(runs)]
+                sections[name] = {
+                    "prep_cold": prep_cold,
+                    "build_cold": build_cold,
+                    "prep_warm": statistics.median(p for p, _ in warm),
+                    "build_warm": statistics.median(b for _, b in warm),
+                }
+        finally:
+            snapshot.DATA_DIR, wordclouds.CACHE_DIR = data_dir, cache_dir
+            st.cache_resource.clear()
+            st.cache_data.clear()
+
+    return {
+        "rows": rows,
+        "sections": sections,
+        "total_cold": sum(s["prep_cold"] + s["build_cold"] for s in sections.values()),
+        "total_warm": sum(s["prep_warm"] + s["build_warm"] for s in sections.values()),
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """Get the sections that are more than `tolerance` times slower than before.
+
+    Sections are compared by their warm time (preparation and figure); times
+    below one millisecond are ignored because they are dominated by noise.
+    """
+    regressions = []
+    for scale, result in report["scales"].items():
+        previous = baseline["scales"].get(scale, {}).get("sections", {})
+        for name, times in result["sections"].items():
+            if name not in previous:
+                continue
+            new = times["prep_warm"] + times["build_warm"]
+            old = previous[name]["prep_warm"] + previous[name]["build_warm"]
+            if new > 1e-3 and new > tolerance * max(old, 1e-3):
+                regressions.append((scale, name, old, new))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard sections")
+    parser.add_argument(
+        "--scales", type=float, nargs="+", default=[1, 10, 100], help="Scale factors"
+    )
+    parser.add_argument(
+        "--runs", type=int, default=3, help="Number of runs with warm caches"
+    )
+    parser.add_argument("--output", default="benchmark.json", help="Report file")
+    parser.add_argument("--baseline", help="Report of an earlier run to compare with")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.5,
+        help="Slowdown factor (vs. the baseline) reported as a regression",
+    )
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    # Caching outside of `streamlit run` logs a warning on every call
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "plotly": plotly.__version__,
+        "runs": args.runs,
+        "scales": {},
+    }
+    for scale in args.scales:
+        result = run_scale(scale, args.runs)
+        report["scales"][f"{scale:g}"] = result
+        print(f"scale {scale:g}")
+        for name, times in result["sections"].items():
+            print(
+                f"  {name:<35} cold {times['prep_cold'] + times['build_cold']:8.3f}s"
+                f"  warm {times['prep_warm'] + times['build_warm']:8.3f}s"
+            )
+        print(
+            f"  {'total':<35} cold {result['total_cold']:8.3f}s"
+            f"  warm {result['total_warm']:8.3f}s"
+        )
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.tolerance)
+        for scale, name, old, new in regressions:
+            print(f"Regression at scale {scale}: {name} {old:.3f}s -> {new:.3f}s")
+        sys.exit(1 if regressions else 0)
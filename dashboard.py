@@ -1,16 +1,26 @@
 # -*- coding: utf-8 -*-
-from urllib.request import urlopen
-import json
 import pandas as pd
 import random
 from datetime import datetime
 
 import streamlit as st
-import plotly.express as px
-from wordcloud import WordCloud
 
+import aggregations
+import artifacts
+import figures
+import hot_reload
+import live
+import profiler
+import search
+import snapshot
+import wordclouds
 
 st.set_page_config(layout="wide", page_title="REMEDi4ALL Dashboard", page_icon=":pill:")
+profiler.start()
+hot_reload.watch()
+live.install()
+artifacts.load_bundle()
+figures.warm_up()
 
 st.title(
     "Dashboard of REMEDi4ALL Expertise",
@@ -33,25 +43,97 @@ with st.expander("Don't know what REMEDi4ALL is?"):
 st.markdown(
     """
         <style>
-            .stTabs [data-baseweb="tab-list"] button [data-testid="stMarkdownContainer"] p {font-size:1rem;}
+            .stRadio [data-testid="stMarkdownContainer"] p {font-size:1rem;}
             .stExpander [data-testid="stMarkdownContainer"] p {font-size: 18px;}
         </style>
     """,
     unsafe_allow_html=True,
-)  # .block-conatiner controls the padding of the page, .stTabs controls the font size of the text in the tabs
+)  # .block-conatiner controls the padding of the page, .stRadio controls the font size of the text in the tab selector
 
 
-tab1, tab2, tab3, tab4 = st.tabs(
-    [
-        "Project Information",
-        "Drug Discovery Expertise",
-        "Clinical Trials Expertise",
-        "Standard Operating Expertise",
-    ]
-)
+# Panels driven by a widget are fragments: changing the widget only reruns the
+# panel, not the whole page
+@profiler.fragment
+def wp_information_panel(wp_data):
+    st.markdown(
+        "<h3 style='text-align: center; color: #54c3c0;'>WP Information</h1>",
+        unsafe_allow_html=True,
+    )
+    selected_wp = st.selectbox("Select WP", wp_data["id"], index=0)
+    selected_wp_data = wp_data[wp_data["id"] == selected_wp]
+    selected_wp_name = selected_wp_data["WP"].values[0]
+    selected_wp_lead = selected_wp_data["lead"].values[0]
+    selected_wp_individuals = selected_wp_data["Individuals"].values[0]
+    selected_wp_organizations = selected_wp_data["Organizations"].values[0]
+
+    container = st.container(border=True)
+    container.write(
+        f""":blue[{selected_wp_name}] (:red[{selected_wp}]) is led by :red[{selected_wp_lead}] and has :red[{selected_wp_organizations}] contributing partners and a total of :red[{selected_wp_individuals}] individuals working on it."""
+    )
+
+    if selected_wp == "WP1":
+        container.write(
+            """WP1 spearheads the "Patients-users co-creation" approach, ensuring patient engagement and partnership from project inception to medicine delivery. It drives the creation of the drug repurposing platform across all stages, from discovery to market access. WP1 is integral to Demonstrator and future User projects, collaborating with Research Development Teams and forming Patient Advocacy Groups. Initial efforts focus on engaging the patient community and implementing co-creation processes, with lessons learned informing the framework for future projects."""
+        )
+
+    elif selected_wp == "WP2":
+        container.write(
+            """WP2 focuses on developing and optimising development of a robust, operational model for the REMEDi4ALL drug repurposing platform. This operational model is being implemented for ongoing Demonstrator Projects and will also be used to support and manage future User Projects. In parallel, WP2 runs the REMEDi4ALL concierge , a portal that facilitates proactive engagement between REMEDi4ALL and a wide array of stakeholders, encompassing researchers, patients, clinicians, funders, investors, and companies involved in translational efforts across Europe, the UK, and beyond"""
+        )
+
+    elif selected_wp == "WP3":
+        container.write(
+            """WP3 focuses on training and education to strengthen the overall capacity within the drug repurposing ecosystem. REMEDi4ALL is dedicated to tackling the inherent challenges of drug repurposing by fostering collaboration among patients, researchers, and developers to refine therapeutic hypotheses and guide candidates through robust preclinical and clinical plans. Thus, an essential component of REMEDi4ALL's mission involves sharing insights and best practices with diverse stakeholders, including patients, researchers, funders, industry partners, and regulatory bodies."""
+        )
+
+    elif selected_wp == "WP4":
+        container.write(
+            """WP4 focuses on the initial phases of drug repurposing projects, with subsequent WPs addressing in vitro approaches and preclinical studies (WP5 and 6, respectively). WP4 is currently dedicated to organizing and assessing a diverse array of in silico resources. These resources support the development of therapeutic hypotheses and the establishment of critical paths for preclinical and clinical development, guided by Target Product Profiles (TPPs) specific to each repurposing project."""
+        )
+
+    elif selected_wp == "WP5":
+        container.write(
+            """WP5 focuses on in vitro biology discovery and screening and is the second of three WPs (WP4, 5, and 6) within REMEDi4ALL dedicated to the discovery and preclinical aspects of drug repurposing projects."""
+        )
+
+    elif selected_wp == "WP6":
+        container.write(
+            """WP6 is the final of the three WPs in REMEDi4ALL dedicated to preclinical discovery and development (WP4, 5, and 6). WP6 focuses on inventorying, systematizing, and applying preclinical resources and expertise across the platform."""
+        )
+
+    elif selected_wp == "WP7":
+        container.write(
+            """WP7 focuses on supporting the implementations of multinational trials, which are key in rare disease contexts."""
+        )
+
+    elif selected_wp == "WP8":
+        container.write(
+            """WP8 aims to improve the European policy environment for drug repurposing."""
+        )
+
+    elif selected_wp == "WP9":
+        container.write(
+            """WP9 aims to transform the drug repurposing ecosystem by actively engaging funders throughout the project lifecycle. By acquiring a deeper understanding of funders' perspectives and building a network encompassing public and private, non-profit, and commercial sectors, WP9 seeks to develop strategies to address market failures and improve conditions for successful drug repurposing."""
+        )
+
+    elif selected_wp == "WP10":
+        container.write(
+            """WP10 focuses on guiding and managing the four Demonstrator projects. These projects serve not only to address scientific and clinical needs but also to inform, optimize, and validate the operational framework of the platform. This hands-on approach fosters collaboration, trust-building, and skill development, positioning REMEDi4ALL to onboard new User projects, thus expanding its impact and sustainability."""
+        )
+
+    elif selected_wp == "WP11":
+        container.write(
+            """WP11 plays a pivotal role in ensuring the meaningful impact of REMEDi4ALL through effective communication, dissemination, and exploitation strategies aligned with project objectives."""
+        )
+
+    elif selected_wp == "WP12":
+        container.write(
+            """WP12 focuses on mapping the drug repurposing landscape, establishing connections with key stakeholders, and engaging with international consortia and repurposing initiatives. This grants significant presence of REMEDi4ALL at both global and EU levels, facilitates alignment of international agendas, and prevents fragmentation within the field."""
+        )
+
 
 # Main content on R4A project
-with tab1:
+def project_tab():
     st.write(
         "The vast majority of the over 7000 known diseases are without effective treatments—there is thus an urgent need to make better use of the medicines that we already have in hand. These include medicines that have already been approved for human use, as well as experimental medicines still in clinical trials already showing good pharmaceutical properties and human safety. In fact, most approved drugs intrinsically have the potential to treat many more diseases than they were originally approved for, even diseases seemingly unrelated to those for which they are currently being prescribed. \n"
     )
@@ -70,166 +152,58 @@ with tab1:
         help="This section allows you know more about the REMEDi4ALL project and see the basic information surrounding the project in the KG.",
     )
 
-    # Get map data
-    with urlopen(
-        "https://raw.githubusercontent.com/leakyMirror/map-of-europe/master/GeoJSON/europe.geojson"
-    ) as response:
-        counties = json.load(response)  # GeoJSON counties
-
-    map_data = pd.read_csv("data/location.csv")
-    total_partners = map_data["Partner counts"].sum()
-    total_countries = map_data.shape[0]
+    with profiler.section("project.map"):
+        map_data = snapshot.get_location()
+        total_partners = map_data["Partner counts"].sum()
+        total_countries = map_data.shape[0]
 
-    org_data = pd.read_csv("data/organization.csv")
-    org_data.sort_values(by="Individuals", ascending=False, inplace=True)
-    total_people = org_data["Individuals"].sum()
+        total_people = snapshot.get_organization()["Individuals"].sum()
 
-    st.markdown(
-        f"REMEDi4ALL project is composed of :red[{total_people}] individuals from :red[{total_partners}] partner organisations working across :red[{total_countries}] countries that bring together a unique combination of expertise to address the complexities of drug repurposing with a patient-centric approach. At our core is a patient-centric drug repurposing platform designed to encompass the complete value chain supporting high impact projects initiating at any phase of development through to market entry and patient access."
-    )
+        st.markdown(
+            f"REMEDi4ALL project is composed of :red[{total_people}] individuals from :red[{total_partners}] partner organisations working across :red[{total_countries}] countries that bring together a unique combination of expertise to address the complexities of drug repurposing with a patient-centric approach. At our core is a patient-centric drug repurposing platform designed to encompass the complete value chain supporting high impact projects initiating at any phase of development through to market entry and patient access."
+        )
 
-    # Geographic Map
-    fig = px.choropleth_mapbox(
-        map_data,
-        geojson=counties,
-        locations="Location",
-        color="Partner counts",
-        color_continuous_scale="Viridis",
-        mapbox_style="open-street-map",
-        zoom=3,
-        center={"lat": 51.0057, "lon": 13.7274},
-        opacity=0.5,
-        labels={"Partner counts": "Institutions"},
-        featureidkey="properties.ISO2",
-    )
-    fig.update_layout(margin={"r": 0, "t": 0, "l": 0, "b": 0})
-    st.plotly_chart(fig, use_container_width=True)
+        # Geographic Map
+        fig = figures.get_figure("partner_map")
+        profiler.plotly_chart(fig, use_container_width=True)
 
     # st.subheader("Individuals from each organization contributing towards the project")
 
-    wp_data = pd.read_csv("data/wp.csv")
-
-    st.write(
-        "REMEDi4ALL was designed with four imbedded drug repurposing projects at various stages of discovery and development to serve as “Demonstrator” projects with which our core platform could be put into practice from the start. In turn, experiences and lessons learned from designing and implementing project plans for these four Demonstrator have already been key in helping to validate, identify gaps and improve the structure of and resources/expertise contained in our core platform. These projects four Demonstrator focus on different indications, namely metastatic pancreatic cancer (mPDAC), pandemic preparedness, osteogenesis imperfecta (OI), and multiple sulfatase deficiency (MSD). The demonstrator portfolio covers different phases of the development path and represents the diverse nature of repurposing projects we are likely to work on in the future. \n"
-    )
-
-    st.write(
-        "In the coming year, REMEDi4ALL will begin processes to expand its project portfolio by bringing on additional “User” projects to be supported by our core drug repurposing platform. \n"
-    )
-
-    st.markdown(
-        f"""The work distribution among REMEDi4ALL partner institutions is delineated through the allocation of work packages, each representing a distinct set of tasks or objectives. There are :red[{len(wp_data)}] work packages in REMEDi4ALL, which serve as the building blocks of collaboration between partners."""
-    )
+    with profiler.section("project.work_packages"):
+        wp_data = snapshot.get_wp()
 
-    col = st.columns((1.5, 1, 1.5), gap="medium")
-
-    with col[0]:
-        st.markdown(
-            "<h3 style='text-align: center; color: #54c3c0;'>WP Overview</h1>",
-            unsafe_allow_html=True,
-        )
-        fig = px.pie(
-            wp_data, values="Individuals", names="WP", hover_name="WP", hole=0.3
+        st.write(
+            "REMEDi4ALL was designed with four imbedded drug repurposing projects at various stages of discovery and development to serve as “Demonstrator” projects with which our core platform could be put into practice from the start. In turn, experiences and lessons learned from designing and implementing project plans for these four Demonstrator have already been key in helping to validate, identify gaps and improve the structure of and resources/expertise contained in our core platform. These projects four Demonstrator focus on different indications, namely metastatic pancreatic cancer (mPDAC), pandemic preparedness, osteogenesis imperfecta (OI), and multiple sulfatase deficiency (MSD). The demonstrator portfolio covers different phases of the development path and represents the diverse nature of repurposing projects we are likely to work on in the future. \n"
         )
-        fig.update_layout(
-            showlegend=False,
+
+        st.write(
+            "In the coming year, REMEDi4ALL will begin processes to expand its project portfolio by bringing on additional “User” projects to be supported by our core drug repurposing platform. \n"
         )
-        st.plotly_chart(fig, use_container_width=True)
 
-    with col[1]:
         st.markdown(
-            "<h3 style='text-align: center; color: #54c3c0;'>WP Information</h1>",
-            unsafe_allow_html=True,
-        )
-        selected_wp = st.selectbox("Select WP", wp_data["id"], index=0)
-        selected_wp_data = wp_data[wp_data["id"] == selected_wp]
-        selected_wp_name = selected_wp_data["WP"].values[0]
-        selected_wp_lead = selected_wp_data["lead"].values[0]
-        selected_wp_individuals = selected_wp_data["Individuals"].values[0]
-        selected_wp_organizations = selected_wp_data["Organizations"].values[0]
-
-        container = st.container(border=True)
-        container.write(
-            f""":blue[{selected_wp_name}] (:red[{selected_wp}]) is led by :red[{selected_wp_lead}] and has :red[{selected_wp_organizations}] contributing partners and a total of :red[{selected_wp_individuals}] individuals working on it."""
+            f"""The work distribution among REMEDi4ALL partner institutions is delineated through the allocation of work packages, each representing a distinct set of tasks or objectives. There are :red[{len(wp_data)}] work packages in REMEDi4ALL, which serve as the building blocks of collaboration between partners."""
         )
 
-        if selected_wp == "WP1":
-            container.write(
-                """WP1 spearheads the "Patients-users co-creation" approach, ensuring patient engagement and partnership from project inception to medicine delivery. It drives the creation of the drug repurposing platform across all stages, from discovery to market access. WP1 is integral to Demonstrator and future User projects, collaborating with Research Development Teams and forming Patient Advocacy Groups. Initial efforts focus on engaging the patient community and implementing co-creation processes, with lessons learned informing the framework for future projects."""
-            )
-
-        elif selected_wp == "WP2":
-            container.write(
-                """WP2 focuses on developing and optimising development of a robust, operational model for the REMEDi4ALL drug repurposing platform. This operational model is being implemented for ongoing Demonstrator Projects and will also be used to support and manage future User Projects. In parallel, WP2 runs the REMEDi4ALL concierge , a portal that facilitates proactive engagement between REMEDi4ALL and a wide array of stakeholders, encompassing researchers, patients, clinicians, funders, investors, and companies involved in translational efforts across Europe, the UK, and beyond"""
-            )
-
-        elif selected_wp == "WP3":
-            container.write(
-                """WP3 focuses on training and education to strengthen the overall capacity within the drug repurposing ecosystem. REMEDi4ALL is dedicated to tackling the inherent challenges of drug repurposing by fostering collaboration among patients, researchers, and developers to refine therapeutic hypotheses and guide candidates through robust preclinical and clinical plans. Thus, an essential component of REMEDi4ALL's mission involves sharing insights and best practices with diverse stakeholders, including patients, researchers, funders, industry partners, and regulatory bodies."""
-            )
-
-        elif selected_wp == "WP4":
-            container.write(
-                """WP4 focuses on the initial phases of drug repurposing projects, with subsequent WPs addressing in vitro approaches and preclinical studies (WP5 and 6, respectively). WP4 is currently dedicated to organizing and assessing a diverse array of in silico resources. These resources support the development of therapeutic hypotheses and the establishment of critical paths for preclinical and clinical development, guided by Target Product Profiles (TPPs) specific to each repurposing project."""
-            )
-
-        elif selected_wp == "WP5":
-            container.write(
-                """WP5 focuses on in vitro biology discovery and screening and is the second of three WPs (WP4, 5, and 6) within REMEDi4ALL dedicated to the discovery and preclinical aspects of drug repurposing projects."""
-            )
-
-        elif selected_wp == "WP6":
-            container.write(
-                """WP6 is the final of the three WPs in REMEDi4ALL dedicated to preclinical discovery and development (WP4, 5, and 6). WP6 focuses on inventorying, systematizing, and applying preclinical resources and expertise across the platform."""
-            )
-
-        elif selected_wp == "WP7":
-            container.write(
-                """WP7 focuses on supporting the implementations of multinational trials, which are key in rare disease contexts."""
-            )
+        col = st.columns((1.5, 1, 1.5), gap="medium")
 
-        elif selected_wp == "WP8":
-            container.write(
-                """WP8 aims to improve the European policy environment for drug repurposing."""
-            )
-
-        elif selected_wp == "WP9":
-            container.write(
-                """WP9 aims to transform the drug repurposing ecosystem by actively engaging funders throughout the project lifecycle. By acquiring a deeper understanding of funders' perspectives and building a network encompassing public and private, non-profit, and commercial sectors, WP9 seeks to develop strategies to address market failures and improve conditions for successful drug repurposing."""
-            )
-
-        elif selected_wp == "WP10":
-            container.write(
-                """WP10 focuses on guiding and managing the four Demonstrator projects. These projects serve not only to address scientific and clinical needs but also to inform, optimize, and validate the operational framework of the platform. This hands-on approach fosters collaboration, trust-building, and skill development, positioning REMEDi4ALL to onboard new User projects, thus expanding its impact and sustainability."""
+        with col[0]:
+            st.markdown(
+                "<h3 style='text-align: center; color: #54c3c0;'>WP Overview</h1>",
+                unsafe_allow_html=True,
             )
+            fig = figures.get_figure("wp_pie")
+            profiler.plotly_chart(fig, use_container_width=True)
 
-        elif selected_wp == "WP11":
-            container.write(
-                """WP11 plays a pivotal role in ensuring the meaningful impact of REMEDi4ALL through effective communication, dissemination, and exploitation strategies aligned with project objectives."""
-            )
+        with col[1]:
+            wp_information_panel(wp_data)
 
-        elif selected_wp == "WP12":
-            container.write(
-                """WP12 focuses on mapping the drug repurposing landscape, establishing connections with key stakeholders, and engaging with international consortia and repurposing initiatives. This grants significant presence of REMEDi4ALL at both global and EU levels, facilitates alignment of international agendas, and prevents fragmentation within the field."""
+        with col[2]:
+            st.markdown(
+                "<h3 style='text-align: center; color: #54c3c0;'>Top 10 organizations</h1>",
+                unsafe_allow_html=True,
             )
-
-    with col[2]:
-        st.markdown(
-            "<h3 style='text-align: center; color: #54c3c0;'>Top 10 organizations</h1>",
-            unsafe_allow_html=True,
-        )
-        org_data = org_data.head(10)
-        fig = px.pie(
-            org_data,
-            values="Individuals",
-            names="Partner",
-            hover_name="Partner",
-            hole=0.3,
-        )
-        fig.update_layout(
-            showlegend=False,
-        )
-        st.plotly_chart(fig, use_container_width=True)
+            fig = figures.get_figure("organizations_pie")
+            profiler.plotly_chart(fig, use_container_width=True)
 
     with st.expander("Want to know more about our vision?"):
         st.write(
@@ -242,47 +216,39 @@ with tab1:
         help="This section allows you know more about a KG and its utility in the project.",
     )
 
-    kg_node_count = pd.read_csv("data/nodes.csv").values[0][0]
-    kg_edge_count = pd.read_csv("data/edges.csv").values[0][0]
-    node_stats = pd.read_csv("data/node_stats.csv")
+    with profiler.section("project.kg"):
+        kg_node_count = snapshot.get_node_count()
+        kg_edge_count = snapshot.get_edge_count()
+        node_stats = snapshot.get_node_stats()
 
-    col = st.columns((1.5, 1.5), gap="medium")
+        col = st.columns((1.5, 1.5), gap="medium")
 
-    with col[0]:
-        st.subheader("What is a Knowledge Graph (KG)?")
-        st.write(
-            """A knowledge graph is a database that uses a graph-structured data model to integrate data from various sources. It is designed to provide a representation of the knowledge domain and is used by a variety of applications for data integration, data sharing and querying. By linking data in KG form, analysts and users can better understand the underlying data and thus answer questions to complex questions in a systematic fashion. The REMEDi4ALL KG is a collection of expertise data from various organizations allowing for a better understanding stakeholders in the project and their contribution to drug repurposing efforts."""
-        )
+        with col[0]:
+            st.subheader("What is a Knowledge Graph (KG)?")
+            st.write(
+                """A knowledge graph is a database that uses a graph-structured data model to integrate data from various sources. It is designed to provide a representation of the knowledge domain and is used by a variety of applications for data integration, data sharing and querying. By linking data in KG form, analysts and users can better understand the underlying data and thus answer questions to complex questions in a systematic fashion. The REMEDi4ALL KG is a collection of expertise data from various organizations allowing for a better understanding stakeholders in the project and their contribution to drug repurposing efforts."""
+            )
 
-        st.write(
-            """In KG terminology, each individual real-world entity (for e.g., Compound name, protein targets, individuals, etc.) is called a :red[node] and a node can be connected to other nodes with help of :red[edges]. To read more about KGs, check out the blogs from [Stanford AI](https://ai.stanford.edu/blog/introduction-to-knowledge-graphs/), [Ontotext](https://www.ontotext.com/knowledgehub/fundamentals/what-is-a-knowledge-graph/), and the [Alan Turing Institute](https://www.turing.ac.uk/research/interest-groups/knowledge-graphs)
+            st.write(
+                """In KG terminology, each individual real-world entity (for e.g., Compound name, protein targets, individuals, etc.) is called a :red[node] and a node can be connected to other nodes with help of :red[edges]. To read more about KGs, check out the blogs from [Stanford AI](https://ai.stanford.edu/blog/introduction-to-knowledge-graphs/), [Ontotext](https://www.ontotext.com/knowledgehub/fundamentals/what-is-a-knowledge-graph/), and the [Alan Turing Institute](https://www.turing.ac.uk/research/interest-groups/knowledge-graphs)
             """
-        )
+            )
 
-        st.write(
-            f"""In the REMEDi4ALL KG, one can find :red[{kg_node_count}] nodes and :red[{kg_edge_count}] edges connecting these nodes. These nodes cover :red[{node_stats.shape[0]}] different types of entities. The section below provides insights into this.
+            st.write(
+                f"""In the REMEDi4ALL KG, one can find :red[{kg_node_count}] nodes and :red[{kg_edge_count}] edges connecting these nodes. These nodes cover :red[{node_stats.shape[0]}] different types of entities. The section below provides insights into this.
             """
-        )
+            )
 
-    with col[1]:
-        st.image(
-            "./docs/kg_intro.png",
-            use_container_width=True,
-            caption="KG applications. Figure taken from Ontotext.",
-            output_format="PNG",
-        )
+        with col[1]:
+            st.image(
+                "./docs/kg_intro.png",
+                use_container_width=True,
+                caption="KG applications. Figure taken from Ontotext.",
+                output_format="PNG",
+            )
 
-    fig = px.bar(
-        node_stats,
-        x="Nodes",
-        y="Counts",
-        labels={"Nodes": "Entity", "Counts": "Count"},
-        color_discrete_sequence=["#54c3c0"],
-        text_auto=True,
-        hover_name="Nodes",
-    )
-    fig.update_layout(title="Node distribution in the KG", title_x=0.5)
-    st.plotly_chart(fig, use_container_width=True)
+        fig = figures.get_figure("node_stats_bar")
+        profiler.plotly_chart(fig, use_container_width=True)
 
     col = st.columns((1.5, 1.5), gap="medium")
     with col[0]:
@@ -317,352 +283,314 @@ with tab1:
         )
 
 
-with tab2:
-    st.write(
-        """
-        :blue-background[Drug discovery] involves the discovery and design of promising drug \
-        candidates. This includes methods that search compound collections, \
-        generate or analyse drug 3D conformations, identify drug targets with \
-        structural docking etc.
-        
-        💡 In this section we look into potential stakeholder's in the project \
-        that can assist you in drug discovery domain."""
-    )
+@profiler.fragment
+def skill_groups_panel():
+    with profiler.section("drug_discovery.skill_groups"):
+        col = st.columns((1.5, 1.5), gap="medium")
+        with col[0]:
+            skill_groups = snapshot.get_skill_groups()["SkillGroup"].values
+            selected_skill = st.selectbox(
+                "Select a skill group you would like to explore.", skill_groups, index=0
+            )
 
-    st.header(
-        "Skills relevant for drug discovery and development",
-        divider="gray",
-        help="This section allows you know explore the drug discovery and development expertise across the project found in the KG.",
-    )
+            fig = figures.get_figure("skill_group_pie", selected_skill)
+            profiler.plotly_chart(fig, use_container_width=True)
 
-    col = st.columns((1.5, 1.5), gap="medium")
-    with col[0]:
-        skill_groups = pd.read_csv("data/skillgroups.csv")["SkillGroup"].values
-        selected_skill = st.selectbox(
-            "Select a skill group you would like to explore.", skill_groups, index=0
-        )
+        with col[1]:
+            skill_metadata = snapshot.get_skills_metadata()
+            skill_metadata_subset = skill_metadata[
+                skill_metadata["SkillGroup"] == selected_skill
+            ]
+            all_skills = skill_metadata_subset["Skill"].values
 
-        skill_distribution_percentage = pd.read_csv("data/skills.csv")
-        m = skill_distribution_percentage["name"] == selected_skill
-        skill_distribution_percentage = skill_distribution_percentage[m]
-        fig = px.pie(
-            skill_distribution_percentage,
-            values="Individuals",
-            names="skill_name",
-            hover_name="skill_name",
-            hole=0.5,
-        )
-        fig.update_layout(
-            showlegend=False,
-            margin=dict(l=20, r=20, t=20, b=20),
-        )
-        st.plotly_chart(fig, use_container_width=True)
+            selected_metadata = st.selectbox(
+                "Select a skill to see description.", all_skills, index=0
+            )
+
+            skill_metadata_subset = skill_metadata_subset[
+                skill_metadata_subset["Skill"] == selected_metadata
+            ]
+            curie = skill_metadata_subset["Curie"].values[0]
+            description = skill_metadata_subset["description"].values[0]
+            url = skill_metadata_subset["url"].values[0]
+
+            st.write(f"**{selected_metadata}**")
+            st.write(f"**Curie**: {curie}")
+            st.write(f"**Description**: {description}")
+            st.write(f"**More information**: {url}")
 
-    with col[1]:
-        skill_metadata = pd.read_csv("data/skills_metadata.csv")
-        skill_metadata_subset = skill_metadata[
-            skill_metadata["SkillGroup"] == selected_skill
-        ]
-        all_skills = skill_metadata_subset["Skill"].values
 
+@profiler.fragment
+def skill_stakeholders_panel():
+    with profiler.section("drug_discovery.skill_stakeholders"):
+        skill_metadata = snapshot.get_skills_metadata()
         selected_metadata = st.selectbox(
-            "Select a skill to see description.", all_skills, index=0
+            "Select a skill to see stakeholders.",
+            skill_metadata["Skill"],
+            index=0,
+            key="stakeholder_skill",
         )
 
-        skill_metadata_subset = skill_metadata_subset[
-            skill_metadata_subset["Skill"] == selected_metadata
-        ]
-        curie = skill_metadata_subset["Curie"].values[0]
-        description = skill_metadata_subset["description"].values[0]
-        url = skill_metadata_subset["url"].values[0]
+        col = st.columns((1.5, 1.5), gap="medium")
+        with col[0]:
+            people_with_skill = snapshot.get_skills_info()
+            people_with_skill_filtered = people_with_skill[
+                people_with_skill["Skill"] == selected_metadata
+            ]
+            people_with_skill_filtered = people_with_skill_filtered[
+                ["Individual", "ORCID", "Affiliation"]
+            ]
+            st.write(
+                f"Found :red[{people_with_skill_filtered.shape[0]}] individuals with this skill."
+            )
+
+            st.data_editor(
+                people_with_skill_filtered,
+                column_config={
+                    "ORCID": st.column_config.LinkColumn(
+                        "Research profile",
+                        help="The ORCID of the individual.",
+                        validate=r"^https://orcid\.org/\d{4}-\d{4}-\d{4}-\d{3}[X0-9]$",
+                        max_chars=100,
+                        display_text=r"https://(.*?)\.streamlit\.app",
+                    ),
+                },
+                disabled=True,
+                hide_index=True,
+            )
 
-        st.write(f"**{selected_metadata}**")
-        st.write(f"**Curie**: {curie}")
-        st.write(f"**Description**: {description}")
-        st.write(f"**More information**: {url}")
+        with col[1]:
+            st.write("Visualizing the distribution of skills across individuals.")
+            if people_with_skill_filtered.shape[0] > 0:
+                fig = figures.get_figure("skill_heatmap", selected_metadata)
+                profiler.plotly_chart(fig, use_container_width=True)
+            else:
+                st.write("No data to visualize.")
 
-    st.header(
-        "Stakeholders for drug development and discovery centric skill",
-        divider="gray",
-        help="This section allows you to identify stakeholders with the domain expertise.",
+
+@profiler.fragment
+def assay_stakeholders_panel():
+    with profiler.section("drug_discovery.assays"):
+        with st.expander(
+            "Experimental stakeholders in drug repurposing",
+            expanded=st.session_state.get("search_panel") == "assay",
+        ):
+            all_assays = snapshot.get_assays()
+
+            selected_assay = st.selectbox(
+                "Select an assay to see stakeholders.",
+                all_assays["Assay"],
+                index=0,
+                key="assay",
+            )
+
+            assay_data = aggregations.get_capability_partners(
+                "assay_data", selected_assay
+            )
+
+            col = st.columns((1.5, 1.5), gap="medium")
+
+            with col[0]:
+                fig = figures.get_figure("capability_pie", "assay_data", selected_assay)
+                profiler.plotly_chart(fig, use_container_width=True)
+
+            with col[1]:
+                assay_metatadata = all_assays[all_assays["Assay"] == selected_assay]
+                assay_curie = assay_metatadata["Curie"].values[0]
+                assay_description = assay_metatadata["Definition"].values[0]
+
+                st.write(f"**{selected_assay}**")
+                st.write(f"**Curie**: {assay_curie}")
+                st.write(f"**Description**: {assay_description}")
+                st.write(
+                    f"Found :red[{assay_data.shape[0]}] organizations with expertise in :red[{selected_assay}]."
+                )
+
+
+@profiler.fragment
+def software_stakeholders_panel():
+    all_software = snapshot.get_software()
+
+    selected_software = st.selectbox(
+        "Select a software/tool to see stakeholders.",
+        all_software["Software"],
+        index=0,
+        key="software",
     )
 
-    selected_metadata = st.selectbox(
-        "Select a skill to see stakeholders.", skill_metadata["Skill"], index=0
+    software_data = aggregations.get_capability_partners(
+        "software_data", selected_software
     )
 
-    col = st.columns((1.5, 1.5), gap="medium")
-    with col[0]:
-        people_with_skill = pd.read_csv("data/skills_info.csv")
-        people_with_skill_filtered = people_with_skill[
-            people_with_skill["Skill"] == selected_metadata
-        ]
-        people_with_skill_filtered = people_with_skill_filtered[
-            ["Individual", "ORCID", "Affiliation"]
-        ]
-        st.write(
-            f"Found :red[{people_with_skill_filtered.shape[0]}] individuals with this skill."
-        )
+    software_metatadata = all_software[all_software["Software"] == selected_software]
+    software_curie = software_metatadata["Curie"].values[0]
 
-        st.data_editor(
-            people_with_skill_filtered,
-            column_config={
-                "ORCID": st.column_config.LinkColumn(
-                    "Research profile",
-                    help="The ORCID of the individual.",
-                    validate=r"^https://orcid\.org/\d{4}-\d{4}-\d{4}-\d{3}[X0-9]$",
-                    max_chars=100,
-                    display_text=r"https://(.*?)\.streamlit\.app",
-                ),
-            },
-            disabled=True,
-            hide_index=True,
-        )
+    st.write(
+        f"Found :red[{software_data.shape[0]}] organizations with expertise in :red[{selected_software} ({software_curie})]"
+    )
 
-    with col[1]:
-        st.write("Visualizing the distribution of skills across individuals.")
-        if people_with_skill_filtered.shape[0] > 0:
-            people_in_filtered = people_with_skill_filtered["Individual"].unique()
-
-            data_list = []
-            for individual in people_in_filtered:
-                tmp = people_with_skill[people_with_skill["Individual"] == individual]
-                for skill in skill_groups:
-                    skill_list = tmp[tmp["Group"] == skill]
-                    if skill == "Communication and Project Management Group":
-                        skill_name = "Communication"
-                    elif skill == "Drug Development Group":
-                        skill_name = "Drug Development"
-                    elif skill == "Drug Discovery Group":
-                        skill_name = "Drug Discovery"
-                    else:
-                        raise ValueError(f"Unknown skill group - {skill}")
-
-                    data_list.append(
-                        {
-                            "individual": individual,
-                            "skill": skill_name,
-                            "count": skill_list.shape[0],
-                        }
-                    )
+    fig = figures.get_figure("capability_pie", "software_data", selected_software)
+    profiler.plotly_chart(fig, use_container_width=True)
 
-            data_df = pd.DataFrame(data_list)
-            new_df = data_df.pivot(index="individual", columns="skill")["count"].fillna(
-                0
-            )
 
-            fig = px.imshow(
-                new_df,
-                x=new_df.columns,
-                y=new_df.index,
-                color_continuous_scale="blues",
-                text_auto=True,
-                aspect="auto",
-            )
-            fig.update_layout(
-                xaxis_title="Skills",
-                yaxis_title="Individuals",
-                margin=dict(l=20, r=20, t=20, b=20),
-            )
-            fig.update(
-                data=[
-                    {
-                        "hovertemplate": "Individual: %{y}<br>Group: %{x}<br># Skills: %{z}"
-                    }
-                ],
-            )
-            fig.update_coloraxes(showscale=False)
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.write("No data to visualize.")
+@profiler.fragment
+def target_class_stakeholders_panel():
+    all_target_classes = snapshot.get_target_classes()
 
-    st.header(
-        "Technology stakeholders in drug repurposing",
-        divider="gray",
-        help="This section allows you to identify organization and individual stakeholders with the technological expertise in software, assay and target classes among others.",
+    selected_target_class = st.selectbox(
+        "Select a target class to see stakeholders.",
+        all_target_classes["Target"],
+        index=0,
+        key="target_class",
     )
 
-    with st.expander("Experimental stakeholders in drug repurposing"):
-        all_assays = pd.read_csv("data/assays.csv")
+    # TODO: Fix this part
+    target_data = aggregations.get_capability_partners(
+        "target_data", selected_target_class
+    )
 
-        selected_assay = st.selectbox(
-            "Select an assay to see stakeholders.", all_assays["Assay"], index=0
-        )
+    target_metatadata = all_target_classes[
+        all_target_classes["Target"] == selected_target_class
+    ]
+    target_curie = target_metatadata["Curie"].values[0]
+
+    st.write(
+        f"Found :red[{target_data.shape[0]}] organizations with expertise in :red[{selected_target_class} ({target_curie})]"
+    )
+
+    fig = figures.get_figure("capability_pie", "target_data", selected_target_class)
+    profiler.plotly_chart(fig, use_container_width=True)
 
-        assay_data = pd.read_csv("data/assay_data.csv")
-        assay_data = assay_data[assay_data["Name"] == selected_assay]
-        assay_data = (
-            assay_data.groupby("Partner")["info"]
-            .count()
-            .reset_index()
-            .assign(Percentage=lambda x: round((x["info"] / x["info"].sum()) * 100, 2))
-        )
 
+@profiler.fragment
+def partner_expertise_panel():
+    with profiler.section("drug_discovery.partner_wordcloud"):
         col = st.columns((1.5, 1.5), gap="medium")
 
         with col[0]:
-            fig = px.pie(
-                assay_data,
-                values="Percentage",
-                names="Partner",
-                hover_name="Partner",
-            )
-            fig.update_layout(
-                showlegend=False,
-                margin=dict(l=20, r=20, t=20, b=20),
+            partners = snapshot.get_partner_info()
+            selected_partner = st.selectbox(
+                "Select a organization to see their expertise.",
+                partners["Name"],
+                index=0,
+                key="partner",
             )
-            st.plotly_chart(fig, use_container_width=True)
 
-        with col[1]:
-            assay_metatadata = all_assays[all_assays["Assay"] == selected_assay]
-            assay_curie = assay_metatadata["Curie"].values[0]
-            assay_description = assay_metatadata["Definition"].values[0]
+            partner_data = partners[partners["Name"] == selected_partner]
+            all_indivudals = snapshot.get_person_info()
+            indivudals_in_selected_partner = all_indivudals[
+                all_indivudals["Partner"] == selected_partner
+            ]
+            if selected_partner == partner_data["acronym"].values[0]:
+                st.write(
+                    f":red[**{selected_partner}**] has :red[{indivudals_in_selected_partner.shape[0]}] individuals working with them."
+                )
+            else:
+                st.write(
+                    f":red[**{selected_partner}**], also known as :red[{partner_data['acronym'].values[0]}], has :red[{indivudals_in_selected_partner.shape[0]}] individuals working with them."
+                )
 
-            st.write(f"**{selected_assay}**")
-            st.write(f"**Curie**: {assay_curie}")
-            st.write(f"**Description**: {assay_description}")
             st.write(
-                f"Found :red[{assay_data.shape[0]}] organizations with expertise in :red[{selected_assay}]."
+                f"Find more about them [here]({partner_data['info_link'].values[0]})"
             )
+        with col[1]:
+            wordcloud = wordclouds.get_partner_wordcloud(selected_partner)
+            if wordcloud is not None:
+                with profiler.timer("render"):
+                    st.image(wordcloud, use_container_width=True)
+            else:
+                st.write("No information found in KG.")
 
-    with st.expander(
-        "In-silico tools and target class stakeholders in drug repurposing"
-    ):
-        col = st.columns((1.5, 1.5), gap="medium")
 
-        with col[0]:
-            all_software = pd.read_csv("data/software.csv")
+def drug_discovery_tab():
+    st.write("""
+        :blue-background[Drug discovery] involves the discovery and design of promising drug \
+        candidates. This includes methods that search compound collections, \
+        generate or analyse drug 3D conformations, identify drug targets with \
+        structural docking etc.
+        
+        💡 In this section we look into potential stakeholder's in the project \
+        that can assist you in drug discovery domain.""")
 
-            selected_software = st.selectbox(
-                "Select a software/tool to see stakeholders.",
-                all_software["Software"],
-                index=0,
-            )
+    st.header(
+        "Skills relevant for drug discovery and development",
+        divider="gray",
+        help="This section allows you know explore the drug discovery and development expertise across the project found in the KG.",
+    )
 
-            software_data = pd.read_csv("data/software_data.csv")
-            software_data = software_data[software_data["Name"] == selected_software]
-            software_data = (
-                software_data.groupby("Partner")["info"]
-                .count()
-                .reset_index()
-                .assign(
-                    Percentage=lambda x: round((x["info"] / x["info"].sum()) * 100, 2)
-                )
-            )
+    skill_groups_panel()
 
-            software_metatadata = all_software[
-                all_software["Software"] == selected_software
-            ]
-            software_curie = software_metatadata["Curie"].values[0]
+    st.header(
+        "Stakeholders for drug development and discovery centric skill",
+        divider="gray",
+        help="This section allows you to identify stakeholders with the domain expertise.",
+    )
 
-            st.write(
-                f"Found :red[{software_data.shape[0]}] organizations with expertise in :red[{selected_software} ({software_curie})]"
-            )
+    skill_stakeholders_panel()
 
-            fig = px.pie(
-                software_data,
-                values="Percentage",
-                names="Partner",
-                hover_name="Partner",
-            )
-            fig.update_layout(
-                showlegend=False, margin=dict(l=20, r=20, t=20, b=20), autosize=False
-            )
-            st.plotly_chart(fig, use_container_width=True)
+    st.header(
+        "Technology stakeholders in drug repurposing",
+        divider="gray",
+        help="This section allows you to identify organization and individual stakeholders with the technological expertise in software, assay and target classes among others.",
+    )
 
-        with col[1]:
-            all_target_classes = pd.read_csv("data/target_class.csv")
+    assay_stakeholders_panel()
 
-            selected_target_class = st.selectbox(
-                "Select a target class to see stakeholders.",
-                all_target_classes["Target"],
-                index=0,
-            )
+    with profiler.section("drug_discovery.software_targets"):
+        with st.expander(
+            "In-silico tools and target class stakeholders in drug repurposing",
+            expanded=st.session_state.get("search_panel")
+            in ("software", "target_class"),
+        ):
+            col = st.columns((1.5, 1.5), gap="medium")
 
-            # TODO: Fix this part
-            target_data = pd.read_csv("data/target_data.csv")
-            target_data = target_data[target_data["Name"] == selected_target_class]
-            target_data = (
-                target_data.groupby("Partner")["info"]
-                .count()
-                .reset_index()
-                .assign(
-                    Percentage=lambda x: round((x["info"] / x["info"].sum()) * 100, 2)
-                )
-            )
+            with col[0]:
+                software_stakeholders_panel()
 
-            target_metatadata = all_target_classes[
-                all_target_classes["Target"] == selected_target_class
-            ]
-            target_curie = target_metatadata["Curie"].values[0]
+            with col[1]:
+                target_class_stakeholders_panel()
 
-            st.write(
-                f"Found :red[{target_data.shape[0]}] organizations with expertise in :red[{selected_target_class} ({target_curie})]"
-            )
+    st.subheader("Organization and their expertise in drug repurposing")
 
-            fig = px.pie(
-                target_data,
-                values="Percentage",
-                names="Partner",
-                hover_name="Partner",
-            )
-            fig.update_layout(
-                showlegend=False,
-                margin=dict(l=20, r=20, t=20, b=20),
-            )
-            st.plotly_chart(fig, use_container_width=True)
+    partner_expertise_panel()
 
-    st.subheader("Organization and their expertise in drug repurposing")
 
-    col = st.columns((1.5, 1.5), gap="medium")
+@profiler.fragment
+def clinical_expertise_panel():
+    with profiler.section("clinical.expertise"):
+        clincal_skills = snapshot.get_clinical_expertise_info()
 
-    with col[0]:
-        partners = pd.read_csv("data/partner_info.csv")
-        selected_partner = st.selectbox(
-            "Select a organization to see their expertise.", partners["Name"], index=0
+        selected_clin_skill = st.selectbox(
+            "Select a clinical skill group you would like to explore.",
+            clincal_skills,
+            index=0,
         )
 
-        partner_data = partners[partners["Name"] == selected_partner]
-        all_indivudals = pd.read_csv("data/person_info.csv")
-        indivudals_in_selected_partner = all_indivudals[
-            all_indivudals["Partner"] == selected_partner
-        ]
-        if selected_partner == partner_data["acronym"].values[0]:
-            st.write(
-                f":red[**{selected_partner}**] has :red[{indivudals_in_selected_partner.shape[0]}] individuals working with them."
+        # Add description
+        tmp = clincal_skills[clincal_skills["Services"] == selected_clin_skill]
+
+        st.write(f"**Description**: {tmp['Definition'].values[0]}\n")
+        if pd.notna(tmp["Source link"].values[0]):
+            st.markdown(
+                f"**Source**: [{tmp['Source'].values[0]}]({tmp['Source link'].values[0]})\n"
             )
         else:
-            st.write(
-                f":red[**{selected_partner}**], also known as :red[{partner_data['acronym'].values[0]}], has :red[{indivudals_in_selected_partner.shape[0]}] individuals working with them."
-            )
+            st.markdown(f"**Source**: {tmp['Source'].values[0]}\n")
 
-        st.write(f"Find more about them [here]({partner_data['info_link'].values[0]})")
-    with col[1]:
-        all_partner_connections = pd.read_csv("data/partner_data.csv")
-
-        all_partner_connections = all_partner_connections[
-            all_partner_connections["Partner"] == selected_partner
-        ]
-        if all_partner_connections.shape[0] > 0:
-            wordcloud = WordCloud(
-                background_color="white", width=512, height=384
-            ).generate(" ".join(all_partner_connections.Name))
-            st.image(wordcloud.to_image(), use_container_width=True)
-        else:
-            st.write("No information found in KG.")
+        # Display the stakeholders
+        fig = figures.get_figure("clinical_heatmap", selected_clin_skill)
+        profiler.plotly_chart(fig, use_container_width=True)
 
 
-with tab3:
-    st.write(
-        """
+def clinical_trials_tab():
+    st.write("""
         :blue-background[Clinical Trials] involves research study that \
         prospectively assigns human participants or groups of humans to one \
         or more health-related interventions to evaluate the effects on \
         health outcomes.
 
         💡 In this section we look into potential stakeholder's in the project \
-        that can assist to managing various aspects of a clinical trial."""
-    )
+        that can assist to managing various aspects of a clinical trial.""")
 
     st.header(
         "Skills relevant for clinical trials management",
@@ -670,129 +598,56 @@ with tab3:
         help="This section allows you know explore the clinical trial related expertise across the project.",
     )
 
-    clincal_skills = pd.read_csv("data/clinical_expertise_info.tsv", sep="\t")
-
-    selected_clin_skill = st.selectbox(
-        "Select a clinical skill group you would like to explore.",
-        clincal_skills,
-        index=0,
-    )
-
-    # Add description
-    tmp = clincal_skills[clincal_skills["Services"] == selected_clin_skill]
+    clinical_expertise_panel()
 
-    st.write(f"**Description**: {tmp['Definition'].values[0]}\n")
-    if pd.notna(tmp["Source link"].values[0]):
-        st.markdown(
-            f"**Source**: [{tmp['Source'].values[0]}]({tmp['Source link'].values[0]})\n"
-        )
-    else:
-        st.markdown(f"**Source**: {tmp['Source'].values[0]}\n")
-
-    # Display the stakeholders
-    clincal_stakeholders = pd.read_csv(
-        "data/clinical_expertise.tsv", sep="\t", index_col=0
-    )
-    clincal_stakeholders.fillna(0, inplace=True)
-    clincal_stakeholders.replace("Available", 0.2, inplace=True)
-
-    for col in clincal_stakeholders.columns:
-        original_val = clincal_stakeholders.loc[selected_clin_skill, col]
-        if original_val > 0:
-            clincal_stakeholders.loc[selected_clin_skill, col] = 1
-
-    fig = px.imshow(
-        clincal_stakeholders,
-        aspect="auto",
-        width=800,
-        height=1000,
-        color_continuous_scale="PuBu",
-    )
 
-    fig.update_layout(
-        xaxis_title="",
-        yaxis_title="",
-        margin=dict(l=20, r=20, t=20, b=20),
-        yaxis=dict(tickfont=dict(size=18)),
-        xaxis=dict(tickfont=dict(size=18)),
-    )
-    fig.update(
-        data=[
-            {
-                "hovertemplate": "Skill: %{y}<br>Organization: %{x}<br> Availability: %{z}"
-            }
-        ],
-    )
-    st.plotly_chart(fig, use_container_width=True)
-
-
-with tab4:
-    so_data = pd.read_csv("data/standard_operations.csv", sep=",")
-    so_categories = pd.read_csv("data/so_categories.csv", sep=",")
-    so_display = so_data[
-        ["ID", "Category", "Title", "Type", "DOI", "Creator", "Reviewer"]
-    ]
+def standard_operations_tab():
+    with profiler.section("sop.data"):
+        so_data = snapshot.get_standard_operations()
+        so_categories = snapshot.get_so_categories()
+        so_display = so_data[
+            ["ID", "Category", "Title", "Type", "DOI", "Creator", "Reviewer"]
+        ]
 
-    all_socs = sorted(list(so_categories["Category"].dropna()))
-    all_keywords = sorted(
-        list(
-            set(
-                kw.strip()
-                for kws in so_data["Keywords"].dropna()
-                for kw in kws.split(",")
+        all_socs = sorted(list(so_categories["Category"].dropna()))
+        all_keywords = sorted(
+            list(
+                set(
+                    kw.strip()
+                    for kws in so_data["Keywords"].dropna()
+                    for kw in kws.split(",")
+                )
             )
         )
-    )
-    if "random_keywords" not in st.session_state:
-        st.session_state.random_keywords = random.sample(
-            all_keywords, min(10, len(all_keywords))
-        )
+        if "random_keywords" not in st.session_state:
+            st.session_state.random_keywords = random.sample(
+                all_keywords, min(10, len(all_keywords))
+            )
 
-    if "selection_kw" not in st.session_state:
-        st.session_state.selection_kw = []  # Initialize the selected keywords list
+        if "selection_kw" not in st.session_state:
+            st.session_state.selection_kw = []  # Initialize the selected keywords list
 
-    all_creators = sorted(
-        list(
-            set(
-                creator.strip()
-                for creators in so_data["Creator"].dropna()
-                for creator in creators.split(",")
-            )
-        )
-    )
-    all_reviewers = sorted(
-        list(
-            set(
-                reviewer.strip()
-                for reviewers in so_data["Reviewer"].dropna()
-                for reviewer in reviewers.split(",")
-            )
-        )
-    )
-    all_types = [
-        "Standard Operating Guideline (SOG)",
-        "Standard Operating Protocol (SOP)",
-        "SOG+SOP",
-    ]
-    all_names = list(set(all_creators + all_reviewers))
+        all_creators = aggregations.get_sop_participant_names("Creator")
+        all_reviewers = aggregations.get_sop_participant_names("Reviewer")
+        all_types = [
+            "Standard Operating Guideline (SOG)",
+            "Standard Operating Protocol (SOP)",
+            "SOG+SOP",
+        ]
 
-    st.write(
-        """
+    st.write("""
         A :blue-background[Standard Operating procedure] is a set of instructions to help project members to carry out routine operation in a standardized way. Here we distinguish between :blue-background[Standard Operating Protocol (SOPs)] for detailed step-by-step manuals and :blue-background[Standard Operating Guidelines (SOGs)] for more general principles. 
         
         Our SOGs and SOPs are assigned to 4 distinct categories (:blue-background[Standard Operating Categories, SOCs]) whether they instruct on: (a) computational analysis, (b) data management and quality, (c) Pre-clinical experimental workflows or (d) Pre-clinical research reporting. On this page you can find and search all our published procedures and 
-        find expertise on a SOG/SOP of interest."""
-    )
+        find expertise on a SOG/SOP of interest.""")
 
     with st.expander(
         "You want to know more about SOP/Gs and the related deliverable in REMEDi4ALL?"
     ):
-        st.write(
-            """
+        st.write("""
             [Click here](https://remedi4all.org/wp-content/uploads/2024/10/REMEDi4ALL_D6.1-Catalogue-of-standards-and-workflows_v1.0.pdf) to learn about the Deliverable "6.1 Catalogue of experimental standards 
                  and workflows" within Remedi4All.
-        """
-        )
+        """)
 
     st.header(
         "Standard Operating Categories",
@@ -800,153 +655,69 @@ with tab4:
         help="This section allows you to explore the different categories standard operating protocols and guidelines are grouped in.",
     )
 
-    col = st.columns((1, 1), gap="large")
+    with profiler.section("sop.categories"):
+        col = st.columns((1, 1), gap="large")
 
-    with col[0]:
-        st.markdown(
-            """
+        with col[0]:
+            st.markdown(
+                """
             <div style="text-align: center; font-weight: bold;">
                 Distribution of Standard Operating Protocols/Guidelines across Categories
             </div>
             """,
-            unsafe_allow_html=True,
-        )
-        soc_stats = so_data["Category"].value_counts().reset_index()
-
-        category_order = [
-            "Pre-clinical experimental workflows",
-            "Computational analysis",
-            "Data management and quality",
-            "Pre-clinical research reporting",
-        ]
-        for category in category_order:
-            if category not in soc_stats["Category"].values:
-                soc_stats.loc[len(soc_stats)] = {"Category": category, "count": 0}
-
-        fig = px.bar(
-            soc_stats,
-            x="Category",
-            y="count",
-            category_orders={"Category": category_order},
-            color_discrete_sequence=["#54c3c0"],
-            text_auto=True,
-            hover_name="Category",
-        )
-        fig.update_traces(
-            hovertemplate="Category: %{x}<br>Count: %{y}",
-        )
-        st.plotly_chart(fig, use_container_width=True)
+                unsafe_allow_html=True,
+            )
+            fig = figures.get_figure("soc_bar")
+            profiler.plotly_chart(fig, use_container_width=True)
 
-        selected_soc = st.selectbox(
-            "Select a standard operating category to see description.",
-            all_socs,
-            index=0,
-        )
-        id = so_data[so_data["Category"] == selected_soc]["ID"]
-        description = so_categories[so_categories["Category"] == selected_soc][
-            "Description"
-        ].iloc[0]
+            selected_soc = st.selectbox(
+                "Select a standard operating category to see description.",
+                all_socs,
+                index=0,
+            )
+            id = so_data[so_data["Category"] == selected_soc]["ID"]
+            description = so_categories[so_categories["Category"] == selected_soc][
+                "Description"
+            ].iloc[0]
 
-        st.write(f"**Description**: {description}")
+            st.write(f"**Description**: {description}")
 
-    with col[1]:
-        st.markdown(
-            """
+    with profiler.section("sop.expertise"):
+        with col[1]:
+            st.markdown(
+                """
             <div style="text-align: center; font-weight: bold;">
                 Distribution of Standard Operating Expertise across Categories
             </div>
             """,
-            unsafe_allow_html=True,
-        )
-        ###Code to create the person/SOC heatmap data###
-
-        # Initialize the result DataFrame with zero counts
-        all_categories = list(so_categories["Category"].tolist())
-        expertise_hp = pd.DataFrame(0, index=all_names, columns=all_categories)
-        so_data["Creator"] = so_data["Creator"].fillna("").astype(str)
-        so_data["Reviewer"] = so_data["Reviewer"].fillna("").astype(str)
-
-        # Populate the counts
-        for _, row in so_data.iterrows():
-            category = row["Category"]
-
-            # Split and clean Creator and Reviewer names (handle NaN safely)
-            creator_str = row["Creator"] if pd.notna(row["Creator"]) else ""
-            reviewer_str = row["Reviewer"] if pd.notna(row["Reviewer"]) else ""
-
-            creators = [name.strip() for name in creator_str.split(",") if name and name.strip()]
-            reviewers = [name.strip() for name in reviewer_str.split(",") if name and name.strip()]
-
-            # Combine creators and reviewers; drop empty strings early
-            participants = set(creators + reviewers)
-
-            # Increment counts in the result DataFrame
-            for participant in participants:
-                if participant:  # already stripped, so this is enough
-                    expertise_hp.loc[participant, category] += 1
-
-        # IMPORTANT: This is what controls the y-axis order in the plot
-        expertise_hp = expertise_hp.reindex(
-            sorted(
-                expertise_hp.index,
-                key=lambda name: name.split()[1].lower() if isinstance(name, str) and len(name.split()) > 1 else ""
+                unsafe_allow_html=True,
             )
-        )
+            fig = figures.get_figure("sop_expertise_heatmap")
 
-        fig = px.imshow(
-            expertise_hp,
-            x=expertise_hp.columns,
-            y=expertise_hp.index,
-            color_continuous_scale="blues",
-            text_auto=True,
-            aspect="auto",
-        )
-
-        fig.update_layout(
-            xaxis_title="Standard Operating Category",
-            yaxis_title="Individuals",
-            margin=dict(l=20, r=20, t=20, b=20),
-        )
+            profiler.plotly_chart(fig, use_container_width=True)
 
-        fig.update(
-            data=[{"hovertemplate": "Individual: %{y}<br>SOC: %{x}<br>#SOG/Ps: %{z}"}],
-        )
-
-        fig.update_coloraxes(showscale=False)
-
-        fig.update_yaxes(
-            tickmode="array",
-            tickvals=list(expertise_hp.index),
-            ticktext=[str(i) for i in expertise_hp.index],
-            tickfont=dict(size=9),
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
-
-        st.markdown(
-            """
+            st.markdown("""
             **Interested in downloading the underlying data?** 
             
-            Download the information with the button below."""
-        )
+            Download the information with the button below.""")
 
-        left, middle, right = st.columns(3)
-        middle.write("")
+            left, middle, right = st.columns(3)
+            middle.write("")
 
-        @st.cache_data
-        def convert_df(df):
-            # IMPORTANT: Cache the conversion to prevent computation on every rerun
-            return df.to_csv().encode("utf-8")
+            @st.cache_data
+            def convert_df(df):
+                # IMPORTANT: Cache the conversion to prevent computation on every rerun
+                return df.to_csv().encode("utf-8")
 
-        csv = convert_df(so_data)
+            csv = convert_df(so_data)
 
-        middle.download_button(
-            label="Download Expertise data",
-            data=csv,
-            file_name="SOP_expertise.csv",
-            mime="text/csv",
-            use_container_width=True,
-        )
+            middle.download_button(
+                label="Download Expertise data",
+                data=csv,
+                file_name="SOP_expertise.csv",
+                mime="text/csv",
+                use_container_width=True,
+            )
 
     st.header(
         "Find a Standard Operating Protocol/Guideline",
@@ -954,133 +725,208 @@ with tab4:
         help="This section allows you to find specific SOG/Ps based on name, keywords, category, type, creators, reviewers etc.",
     )
 
-    col2 = st.columns((1.5, 1), gap="large")
-
-    with col2[0]:
-        all_filters = [
-            "SOG/Ps Name",
-            "ID",
-            "Category",
-            "Keywords",
-            "Type",
-            "Creator",
-            "Reviewer",
-        ]
-        selected_filter = st.selectbox(
-            "Select a filter to search SOGs/SOPs.", all_filters, index=2
-        )
+    with profiler.section("sop.search"):
+        col2 = st.columns((1.5, 1), gap="large")
 
-    with col2[1]:
-        if selected_filter == "Category":
-            all_socs.insert(0, "All")
-            selected_soc = st.selectbox(
-                "Select a standard operating category to see all related SOG/Ps.",
-                all_socs,
-                index=0,
+        with col2[0]:
+            all_filters = [
+                "SOG/Ps Name",
+                "ID",
+                "Category",
+                "Keywords",
+                "Type",
+                "Creator",
+                "Reviewer",
+                "Full text",
+            ]
+            selected_filter = st.selectbox(
+                "Select a filter to search SOGs/SOPs.", all_filters, index=2
             )
 
-        if selected_filter == "SOG/Ps Name":
-            text_input = st.text_input(
-                "Enter parts or the full name of the SOG/Ps you are looking for:",
-            )
-        if selected_filter == "ID":
-            text_input = st.text_input(
-                "Enter part of or the full ID of the SOG/Ps you are looking for:",
-            )
-        if selected_filter == "Type":
-            all_types.insert(0, "All")
-            selected_type = st.selectbox(
-                "Select a standard operating type to see all related SOG/Ps.",
-                all_types,
-                index=0,
-            )
-        if selected_filter == "Creator":
-            selected_creator = st.selectbox(
-                "Select a creator to see all SOG/Ps they created.",
-                all_creators,
-                index=0,
-            )
-        if selected_filter == "Reviewer":
-            selected_reviewer = st.selectbox(
-                "Select a reviewer to see all SOG/Ps they reviewed.",
-                all_reviewers,
-                index=0,
-            )
+        with col2[1]:
+            if selected_filter == "Category":
+                all_socs.insert(0, "All")
+                selected_soc = st.selectbox(
+                    "Select a standard operating category to see all related SOG/Ps.",
+                    all_socs,
+                    index=0,
+                )
 
-        if selected_filter == "Keywords":
-            text_input2 = st.text_input(
-                "Enter parts or the full name of keywords to filter (selection is case-sensitive):",
-            )
-            if text_input2 == "":
-                selection_kw = st.pills(
-                    "Some example keywords",
-                    st.session_state.random_keywords,
-                    selection_mode="multi",
+            if selected_filter == "SOG/Ps Name":
+                text_input = st.text_input(
+                    "Enter parts or the full name of the SOG/Ps you are looking for:",
                 )
-            else:
-                filtered_kws = [
-                    key for key in all_keywords if key.find(text_input2) != -1
-                ]
-                selection_kw = st.pills(
-                    "Found keywords", filtered_kws, selection_mode="multi"
+            if selected_filter == "ID":
+                text_input = st.text_input(
+                    "Enter part of or the full ID of the SOG/Ps you are looking for:",
                 )
-            # Save the user's selected keywords in session state
-            st.session_state.selection_kw = selection_kw
-
-    st.write("")
-    if selected_soc == "All":
-        dataframe_subset = so_display
-    elif selected_filter == "Category" and selected_soc != "All":
-        dataframe_subset = so_display[so_data["Category"] == selected_soc]
-    elif selected_filter == "SOG/Ps Name" and selected_soc != "All":
-        dataframe_subset = so_display[
-            so_data["Title"].str.contains(text_input, case=False, na=False)
-        ]
-    elif selected_filter == "ID" and selected_soc != "All":
-        dataframe_subset = so_display[
-            so_data["ID"].str.contains(text_input, case=False, na=False)
-        ]
-    elif selected_filter == "Type":
-        if selected_type == "All":
+            if selected_filter == "Full text":
+                text_input = st.text_input(
+                    "Enter words from the name, keywords, category, creators or reviewers:",
+                )
+            if selected_filter == "Type":
+                all_types.insert(0, "All")
+                selected_type = st.selectbox(
+                    "Select a standard operating type to see all related SOG/Ps.",
+                    all_types,
+                    index=0,
+                )
+            if selected_filter == "Creator":
+                selected_creator = st.selectbox(
+                    "Select a creator to see all SOG/Ps they created.",
+                    all_creators,
+                    index=0,
+                )
+            if selected_filter == "Reviewer":
+                selected_reviewer = st.selectbox(
+                    "Select a reviewer to see all SOG/Ps they reviewed.",
+                    all_reviewers,
+                    index=0,
+                )
+
+            if selected_filter == "Keywords":
+                text_input2 = st.text_input(
+                    "Enter parts or the full name of keywords to filter:",
+                )
+                if text_input2 == "":
+                    selection_kw = st.pills(
+                        "Some example keywords",
+                        st.session_state.random_keywords,
+                        selection_mode="multi",
+                    )
+                else:
+                    filtered_kws = [
+                        key
+                        for key in all_keywords
+                        if text_input2.lower() in key.lower()
+                    ]
+                    selection_kw = st.pills(
+                        "Found keywords", filtered_kws, selection_mode="multi"
+                    )
+                # Save the user's selected keywords in session state
+                st.session_state.selection_kw = selection_kw
+
+        st.write("")
+        sop_index = search.get_sop_index()
+        if selected_soc == "All":
             dataframe_subset = so_display
-        else:
-            mapper = {
-                "Standard Operating Guideline (SOG)": "SOG",
-                "Standard Operating Protocol (SOP)": "SOP",
-                "SOG+SOP": "SOP, SOG",
-            }
-            dataframe_subset = so_display[so_data["Type"] == mapper[selected_type]]
-
-    elif selected_filter == "Creator" and selected_soc != "All":
-        dataframe_subset = so_display[
-            so_data["Creator"].str.contains(selected_creator, case=False, na=False)
-        ]
-    if selected_filter == "Reviewer" and selected_soc != "All":
-        dataframe_subset = so_display[
-            so_data["Reviewer"].str.contains(selected_reviewer, case=False, na=False)
-        ]
-    if selected_filter == "Keywords" and selected_soc != "All":
-        if st.session_state.selection_kw:  # Check if any keywords are selected
-            pattern = "|".join(st.session_state.selection_kw)
+        elif selected_filter == "Category" and selected_soc != "All":
+            dataframe_subset = so_display[so_data["Category"] == selected_soc]
+        elif selected_filter == "SOG/Ps Name" and selected_soc != "All":
+            dataframe_subset = so_display.iloc[
+                sop_index.search(text_input, fields=["Title"])
+            ]
+        elif selected_filter == "ID" and selected_soc != "All":
+            # IDs are matched as a whole, with their separators
             dataframe_subset = so_display[
-                so_data["Keywords"].str.contains(pattern, case=False, na=False)
+                so_data["ID"].str.contains(
+                    text_input, case=False, na=False, regex=False
+                )
             ]
-        else:
-            dataframe_subset = so_display.copy()
-
-    st.data_editor(
-        dataframe_subset,
-        column_config={
-            "DOI": st.column_config.LinkColumn(
-                "Zenodo entry",
-                help="The Zenodo entry for the SOP/SOG.",
-                max_chars=100,
-                display_text=r"https://(.*?)\.streamlit\.app",
-            ),
-        },
-        disabled=True,
-        hide_index=True,
+        elif selected_filter == "Full text":
+            dataframe_subset = so_display.iloc[sop_index.search(text_input)]
+        elif selected_filter == "Type":
+            if selected_type == "All":
+                dataframe_subset = so_display
+            else:
+                mapper = {
+                    "Standard Operating Guideline (SOG)": "SOG",
+                    "Standard Operating Protocol (SOP)": "SOP",
+                    "SOG+SOP": "SOP, SOG",
+                }
+                dataframe_subset = so_display[so_data["Type"] == mapper[selected_type]]
+
+        elif selected_filter == "Creator" and selected_soc != "All":
+            sop_participants = aggregations.get_sop_participants()
+            creator_ids = sop_participants.loc[
+                (sop_participants["Role"] == "Creator")
+                & (sop_participants["Name"] == selected_creator),
+                "ID",
+            ]
+            dataframe_subset = so_display[so_data["ID"].isin(creator_ids)]
+        if selected_filter == "Reviewer" and selected_soc != "All":
+            sop_participants = aggregations.get_sop_participants()
+            reviewer_ids = sop_participants.loc[
+                (sop_participants["Role"] == "Reviewer")
+                & (sop_participants["Name"] == selected_reviewer),
+                "ID",
+            ]
+            dataframe_subset = so_display[so_data["ID"].isin(reviewer_ids)]
+        if selected_filter == "Keywords" and selected_soc != "All":
+            if st.session_state.selection_kw:  # Check if any keywords are selected
+                dataframe_subset = so_display.iloc[
+                    sop_index.match_tags("Keywords", st.session_state.selection_kw)
+                ]
+            else:
+                dataframe_subset = so_display.copy()
+
+        st.data_editor(
+            dataframe_subset,
+            column_config={
+                "DOI": st.column_config.LinkColumn(
+                    "Zenodo entry",
+                    help="The Zenodo entry for the SOP/SOG.",
+                    max_chars=100,
+                    display_text=r"https://(.*?)\.streamlit\.app",
+                ),
+            },
+            disabled=True,
+            hide_index=True,
+        )
+
+
+# Entity type -> (tab, key of the selectbox showing the entity)
+SEARCH_TARGETS = {
+    "Person": ("Drug Discovery Expertise", "partner"),
+    "Organisation": ("Drug Discovery Expertise", "partner"),
+    "Skill": ("Drug Discovery Expertise", "stakeholder_skill"),
+    "Assay": ("Drug Discovery Expertise", "assay"),
+    "Software": ("Drug Discovery Expertise", "software"),
+    "Target class": ("Drug Discovery Expertise", "target_class"),
+}
+
+
+@profiler.fragment
+def global_search_panel():
+    query = st.text_input(
+        "Search the KG",
+        placeholder="Search people, organisations, skills, assays, software and target classes",
+        label_visibility="collapsed",
     )
+    matches = search.search_entities(query)
+    if query and matches.empty:
+        st.write("No matches found in the KG.")
+
+    for i, (entity_type, name, details) in enumerate(
+        matches[["Type", "Name", "Details"]].itertuples(index=False)
+    ):
+        label = f"**{name}** · {entity_type}" + (f" · {details}" if details else "")
+        if st.button(label, key=f"search_result_{i}"):
+            tab, widget_key = SEARCH_TARGETS[entity_type]
+            # People are shown through the panel of their organisation
+            value = details if entity_type == "Person" else name
+            st.session_state["tab"] = tab
+            if value:
+                st.session_state[widget_key] = value
+            st.session_state["search_panel"] = widget_key
+            st.rerun()
+
+
+# Only the selected tab is executed, so an interaction in one tab does not
+# rerun the data preparation and figures of the others
+TABS = {
+    "Project Information": project_tab,
+    "Drug Discovery Expertise": drug_discovery_tab,
+    "Clinical Trials Expertise": clinical_trials_tab,
+    "Standard Operating Expertise": standard_operations_tab,
+}
+
+global_search_panel()
+
+selected_tab = st.radio(
+    "Select a tab", list(TABS), horizontal=True, label_visibility="collapsed", key="tab"
+)
+TABS[selected_tab]()
 
 # Define your custom CSS
 custom_css = """
@@ -1112,3 +958,5 @@ with col[1]:
 
 with col[2]:
     st.image("./docs/Remedi4Alllogo.png", width=90)
+
+profiler.report()
@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+"""Cached Plotly figures of the dashboard.
+
+Building a figure with Plotly Express takes tens of milliseconds, most of it
+in validating the figure, while showing a finished figure only needs its JSON
+serialization. Figures are therefore memoized per figure id, selection and
+version of the snapshot tables they are built from, in a bounded LRU cache
+shared by all sessions. The figures of the default selections are built in the
+background when the app starts, so the first page views are served from the
+cache as well.
+
+Plotly Express is imported by the builders on first use, so importing this
+module does not slow down the start of the dashboard.
+
+The returned figures are shared objects: callers must not modify them.
+"""
+import os
+import threading
+
+import streamlit as st
+
+import aggregations
+import artifacts
+import geo
+import snapshot
+
+# Maximum number of figures kept in memory
+FIGURE_CACHE_SIZE = int(os.environ.get("KG_FIGURE_CACHE_SIZE", "256"))
+
+# Order of the standard operating categories in the bar chart
+SOC_ORDER = [
+    "Pre-clinical experimental workflows",
+    "Computational analysis",
+    "Data management and quality",
+    "Pre-clinical research reporting",
+]
+
+
+def partner_map():
+    import plotly.express as px
+
+    map_data = snapshot.get_location()
+    counties = geo.load_europe_geojson(
+        tuple(sorted(map_data["Location"].dropna().unique()))
+    )
+    fig = px.choropleth_mapbox(
+        map_data,
+        geojson=counties,
+        locations="Location",
+        color="Partner counts",
+        color_continuous_scale="Viridis",
+        mapbox_style="open-street-map",
+        zoom=3,
+        center={"lat": 51.0057, "lon": 13.7274},
+        opacity=0.5,
+        labels={"Partner counts": "Institutions"},
+        featureidkey="properties.ISO2",
+    )
+    fig.update_layout(margin={"r": 0, "t": 0, "l": 0, "b": 0})
+    return fig
+
+
+def wp_pie():
+    import plotly.express as px
+
+    fig = px.pie(
+        snapshot.get_wp(), values="Individuals", names="WP", hover_name="WP", hole=0.3
+    )
+    fig.update_layout(
+        showlegend=False,
+    )
+    return fig
+
+
+def organizations_pie():
+    import plotly.express as px
+
+    org_data = snapshot.get_organization().sort_values(
+        by="Individuals", ascending=False
+    )
+    fig = px.pie(
+        org_data.head(10),
+        values="Individuals",
+        names="Partner",
+        hover_name="Partner",
+        hole=0.3,
+    )
+    fig.update_layout(
+        showlegend=False,
+    )
+    return fig
+
+
+def node_stats_bar():
+    import plotly.express as px
+
+    fig = px.bar(
+        snapshot.get_node_stats(),
+        x="Nodes",
+        y="Counts",
+        labels={"Nodes": "Entity", "Counts": "Count"},
+        color_discrete_sequence=["#54c3c0"],
+        text_auto=True,
+        hover_name="Nodes",
+    )
+    fig.update_layout(title="Node distribution in the KG", title_x=0.5)
+    return fig
+
+
+def skill_group_pie(skill_group: str):
+    import plotly.express as px
+
+    skills = snapshot.get_skills()
+    fig = px.pie(
+        skills[skills["name"] == skill_group],
+        values="Individuals",
+        names="skill_name",
+        hover_name="skill_name",
+        hole=0.5,
+    )
+    fig.update_layout(
+        showlegend=False,
+        margin=dict(l=20, r=20, t=20, b=20),
+    )
+    return fig
+
+
+def skill_heatmap(skill: str):
+    import plotly.express as px
+
+    skills_info = snapshot.get_skills_info()
+    individuals = skills_info.loc[skills_info["Skill"] == skill, "Individual"]
+    skill_group_matrix = aggregations.get_skill_group_matrix()
+    new_df = skill_group_matrix[skill_group_matrix.index.isin(individuals)]
+
+    fig = px.imshow(
+        new_df,
+        x=new_df.columns,
+        y=new_df.index,
+        color_continuous_scale="blues",
+        text_auto=True,
+        aspect="auto",
+    )
+    fig.update_layout(
+        xaxis_title="Skills",
+        yaxis_title="Individuals",
+        margin=dict(l=20, r=20, t=20, b=20),
+    )
+    fig.update(
+        data=[{"hovertemplate": "Individual: %{y}<br>Group: %{x}<br># Skills: %{z}"}],
+    )
+    fig.update_coloraxes(showscale=False)
+    return fig
+
+
+def capability_pie(table: str, capability: str):
+    import plotly.express as px
+
+    fig = px.pie(
+        aggregations.get_capability_partners(table, capability),
+        values="Percentage",
+        names="Partner",
+        hover_name="Partner",
+    )
+    fig.update_layout(
+        showlegend=False,
+        margin=dict(l=20, r=20, t=20, b=20),
+    )
+    if table == "software_data":
+        fig.update_layout(autosize=False)
+    return fig
+
+
+def clinical_heatmap(service: str):
+    import plotly.express as px
+
+    clincal_stakeholders = (
+        snapshot.get_clinical_expertise().fillna(0).replace("Available", 0.2)
+    )
+
+    for col in clincal_stakeholders.columns:
+        original_val = clincal_stakeholders.loc[service, col]
+        if original_val > 0:
+            clincal_stakeholders.loc[service, col] = 1
+
+    fig = px.imshow(
+        clincal_stakeholders,
+        aspect="auto",
+        width=800,
+        height=1000,
+        color_continuous_scale="PuBu",
+    )
+
+    fig.update_layout(
+        xaxis_title="",
+        yaxis_title="",
+        margin=dict(l=20, r=20, t=20, b=20),
+        yaxis=dict(tickfont=dict(size=18)),
+        xaxis=dict(tickfont=dict(size=18)),
+    )
+    fig.update(
+        data=[
+            {
+                "hovertemplate": "Skill: %{y}<br>Organization: %{x}<br> Availability: %{z}"
+            }
+        ],
+    )
+    return fig
+
+
+def soc_bar():
+    import plotly.express as px
+
+    so_data = snapshot.get_standard_operations()
+    soc_stats = so_data["Category"].value_counts().reset_index()
+    for category in SOC_ORDER:
+        if category not in soc_stats["Category"].values:
+            soc_stats.loc[len(soc_stats)] = {"Category": category, "count": 0}
+
+    fig = px.bar(
+        soc_stats,
+        x="Category",
+        y="count",
+        category_orders={"Category": SOC_ORDER},
+        color_discrete_sequence=["#54c3c0"],
+        text_auto=True,
+        hover_name="Category",
+    )
+    fig.update_traces(
+        hovertemplate="Category: %{x}<br>Count: %{y}",
+    )
+    return fig
+
+
+def sop_expertise_heatmap():
+    import plotly.express as px
+
+    # IMPORTANT: The matrix index is what controls the y-axis order in the plot
+    expertise_hp = aggregations.get_sop_expertise_matrix()
+
+    fig = px.imshow(
+        expertise_hp,
+        x=expertise_hp.columns,
+        y=expertise_hp.index,
+        color_continuous_scale="blues",
+        text_auto=True,
+        aspect="auto",
+    )
+
+    fig.update_layout(
+        xaxis_title="Standard Operating Category",
+        yaxis_title="Individuals",
+        margin=dict(l=20, r=20, t=20, b=20),
+    )
+
+    fig.update(
+        data=[{"hovertemplate": "Individual: %{y}<br>SOC: %{x}<br>#SOG/Ps: %{z}"}],
+    )
+
+    fig.update_coloraxes(showscale=False)
+
+    fig.update_yaxes(
+        tickmode="array",
+        tickvals=list(expertise_hp.index),
+        ticktext=[str(i) for i in expertise_hp.index],
+        tickfont=dict(size=9),
+    )
+    return fig
+
+
+# Figure id -> (builder, snapshot tables the figure is built from)
+FIGURES = {
+    "partner_map": (partner_map, ["location"]),
+    "wp_pie": (wp_pie, ["wp"]),
+    "organizations_pie": (organizations_pie, ["organization"]),
+    "node_stats_bar": (node_stats_bar, ["node_stats"]),
+    "skill_group_pie": (skill_group_pie, ["skills"]),
+    "skill_heatmap": (skill_heatmap, ["skills_info", "skillgroups"]),
+    "capability_pie": (capability_pie, list(aggregations.CAPABILITY_TABLES)),
+    "clinical_heatmap": (clinical_heatmap, ["clinical_expertise"]),
+    "soc_bar": (soc_bar, ["standard_operations"]),
+    "sop_expertise_heatmap": (
+        sop_expertise_heatmap,
+        ["standard_operations", "so_categories"],
+    ),
+}
+
+
+@st.cache_resource(show_spinner=False, max_entries=FIGURE_CACHE_SIZE)
+def _figure(figure_id: str, selection: tuple, versions: tuple):
+    builder, tables = FIGURES[figure_id]
+    baked = artifacts.lookup(("figure", figure_id, selection), tables)
+    if baked is not None:
+        return baked
+    return builder(*selection)
+
+
+def get_figure(figure_id: str, *selection):
+    """Get a figure for the given selection, building it only on a cache miss."""
+    _, tables = FIGURES[figure_id]
+    versions = tuple(snapshot.table_signature(table) for table in tables)
+    return _figure(figure_id, selection, versions)
+
+
+def default_selections() -> list:
+    """Get the (figure id, selection) pairs shown when the dashboard is opened."""
+    selections = [
+        (figure_id, ())
+        for figure_id in (
+            "partner_map",
+            "wp_pie",
+            "organizations_pie",
+            "node_stats_bar",
+            "soc_bar",
+            "sop_expertise_heatmap",
+        )
+    ]
+    # Selectboxes show their first option by default
+    first_options = {
+        "skill_group_pie": snapshot.get_skill_groups()["SkillGroup"],
+        "skill_heatmap": snapshot.get_skills_metadata()["Skill"],
+        "clinical_heatmap": snapshot.get_clinical_expertise_info()["Services"],
+    }
+    for figure_id, options in first_options.items():
+        if len(options) > 0:
+            selections.append((figure_id, (options.iloc[0],)))
+    capability_options = {
+        "assay_data": snapshot.get_assays()["Assay"],
+        "software_data": snapshot.get_software()["Software"],
+        "target_data": snapshot.get_target_classes()["Target"],
+    }
+    for table, options in capability_options.items():
+        if len(options) > 0:
+            selections.append(("capability_pie", (table, options.iloc[0])))
+    return selections
+
+
+def _warm():
+    for figure_id, selection in default_selections():
+        get_figure(figure_id, *selection)
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _start_warmup(snapshot_version: tuple) -> threading.Thread:
+    thread = threading.Thread(target=_warm, name="figure-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def warm_up():
+    """Build the default figures in the background, once per snapshot version."""
+    tables = sorted({table for _, tables in FIGURES.values() for table in tables})
+    _start_warmup(tuple(snapshot.table_signature(table) for table in tables))
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""Country geometries for the partner choropleth.
+
+The Europe GeoJSON is vendored in the assets directory (Natural Earth 1:110m,
+public domain) so that the dashboard does not depend on a network request. It
+is read once per process, pruned to the countries that are actually shown and
+simplified with the Douglas-Peucker algorithm before it is handed to Plotly.
+"""
+import json
+import math
+import os
+
+import streamlit as st
+
+GEOJSON_PATH = "assets/europe.geojson"
+
+# Simplification tolerance in degrees, 0 disables simplification
+SIMPLIFY_TOLERANCE = float(os.environ.get("KG_GEOJSON_TOLERANCE", "0.05"))
+
+
+def simplify_line(points: list, tolerance: float) -> list:
+    """Simplify a line (or closed ring) with the Douglas-Peucker algorithm."""
+    if tolerance <= 0 or len(points) < 3:
+        return points
+
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+
+    while stack:
+        start, end = stack.pop()
+        x1, y1 = points[start]
+        x2, y2 = points[end]
+        dx, dy = x2 - x1, y2 - y1
+        norm = math.hypot(dx, dy)
+
+        max_dist, index = 0.0, None
+        for i in range(start + 1, end):
+            x, y = points[i]
+            if norm == 0:
+                dist = math.hypot(x - x1, y - y1)
+            else:
+                dist = abs(dy * x - dx * y + x2 * y1 - y2 * x1) / norm
+            if dist > max_dist:
+                max_dist, index = dist, i
+
+        if index is not None and max_dist > tolerance:
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def _simplify_polygon(rings: list, tolerance: float) -> list:
+    simplified = []
+    for ring in rings:
+        new_ring = simplify_line(ring, tolerance)
+        # A valid linear ring needs at least 4 positions
+        simplified.append(new_ring if len(new_ring) >= 4 else ring)
+    return simplified
+
+
+def simplify_geometry(geometry: dict, tolerance: float) -> dict:
+    """Simplify a Polygon or MultiPolygon geometry."""
+    if geometry["type"] == "Polygon":
+        coordinates = _simplify_polygon(geometry["coordinates"], tolerance)
+    elif geometry["type"] == "MultiPolygon":
+        coordinates = [
+            _simplify_polygon(polygon, tolerance)
+            for polygon in geometry["coordinates"]
+        ]
+    else:
+        coordinates = geometry["coordinates"]
+    return {"type": geometry["type"], "coordinates": coordinates}
+
+
+@st.cache_resource(show_spinner=False)
+def _read_geojson(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def load_europe_geojson(
+    iso2_codes: tuple, tolerance: float = SIMPLIFY_TOLERANCE
+) -> dict:
+    """Get the Europe GeoJSON restricted to the given ISO2 codes.
+
+    The result is shared across sessions and must not be modified.
+    """
+    wanted = set(iso2_codes)
+    features = [
+        {
+            "type": "Feature",
+            "properties": feature["properties"],
+            "geometry": simplify_geometry(feature["geometry"], tolerance),
+        }
+        for feature in _read_geojson(GEOJSON_PATH)["features"]
+        if feature["properties"]["ISO2"] in wanted
+    ]
+    return {"type": "FeatureCollection", "features": features}
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""Hot reload of snapshots published to a mounted directory.
+
+Instead of the snapshot baked into the Docker image, the dashboard can serve
+the latest snapshot published to a directory mounted into the container (set
+KG_SNAPSHOT_ROOT). Every snapshot is a subdirectory with the files of the data
+directory, their Arrow copies and a manifest listing the content hashes and row
+count of every table. The manifest is written last, so a snapshot without a
+manifest is incomplete:
+
+    python hot_reload.py /mnt/snapshots               # publish data/
+    python hot_reload.py /mnt/snapshots --keep 5      # keep 5 snapshots
+
+The dashboard watches the directory (polling every KG_SNAPSHOT_POLL seconds if
+set, e.g. for network file systems that do not report changes) and serves the
+newest snapshot, by name, whose files match its manifest. The tables that
+changed are read and checked against the row counts of the manifest before the
+snapshot is swapped in at once; tables with unchanged hashes keep their cached
+frames, aggregations and figures. A script run reads all its tables from the
+snapshot that was current when it started, so older snapshots are only removed
+by the next publications (the latest KG_SNAPSHOT_KEEP are kept).
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from datetime import datetime
+from typing import Optional
+
+import pandas as pd
+import streamlit as st
+from pyarrow import feather
+
+import snapshot
+
+SNAPSHOT_ROOT = os.environ.get("KG_SNAPSHOT_ROOT")
+KEEP = int(os.environ.get("KG_SNAPSHOT_KEEP", "3"))
+POLL_INTERVAL = float(os.environ.get("KG_SNAPSHOT_POLL", "0"))
+
+MANIFEST = "manifest.json"
+
+logger = logging.getLogger(__name__)
+
+_reload_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    """Check whether snapshots are served from a mounted directory."""
+    return bool(SNAPSHOT_ROOT)
+
+
+def file_hash(path: str) -> str:
+    """Get the SHA-256 hash of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def publish(root: str, data_dir: str = snapshot.DATA_DIR, keep: int = KEEP) -> str:
+    """Copy the tables of a data directory to a new snapshot and return its path."""
+    directory = _new_directory(root)
+
+    tables = {}
+    for name, (file_name, read_kwargs) in snapshot.TABLES.items():
+        path = os.path.join(data_dir, file_name)
+        if not os.path.exists(path):
+            continue
+        shutil.copy2(path, directory)
+        df = pd.read_csv(path, **read_kwargs)
+        arrow_path = os.path.join(directory, f"{name}.arrow")
+        feather.write_feather(df, arrow_path, compression="uncompressed")
+        tables[name] = {
+            "file": file_name,
+            "sha256": file_hash(path),
+            "rows": len(df),
+            "arrow": {
+                "sha256": file_hash(arrow_path),
+                "size": os.path.getsize(arrow_path),
+            },
+        }
+
+    manifest = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "tables": tables,
+    }
+    manifest_path = os.path.join(directory, MANIFEST)
+    with open(f"{manifest_path}.tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+
+    for old in published(root)[:-keep]:
+        shutil.rmtree(old, ignore_errors=True)
+    return directory
+
+
+def _new_directory(root: str) -> str:
+    # Named by time, so the names sort in the order of publication
+    name = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    for attempt in range(100):
+        directory = os.path.join(root, f"{name}-{attempt}" if attempt else name)
+        try:
+            os.makedirs(directory)
+            return directory
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"No free snapshot directory for {name} in {root}")
+
+
+def published(root: str) -> list:
+    """Get the snapshot directories with a manifest, oldest first."""
+    if not os.path.isdir(root):
+        return []
+    return [
+        os.path.join(root, name)
+        for name in sorted(os.listdir(root))
+        if os.path.exists(os.path.join(root, name, MANIFEST))
+    ]
+
+
+def verify(directory: str) -> tuple:
+    """Get the (directory, table hashes) and row counts of a complete snapshot.
+
+    Raises ValueError if a file is missing or does not match the manifest. The
+    dashboard reads the Arrow copy of a table if there is one (see
+    snapshot.source_path), so a snapshot with an Arrow file that is not in the
+    manifest is incomplete as well.
+    """
+    with open(os.path.join(directory, MANIFEST)) as f:
+        manifest = json.load(f)
+
+    hashes, rows = {}, {}
+    for name, entry in manifest["tables"].items():
+        if name not in snapshot.TABLES:
+            continue
+        # The files the dashboard reads for the table
+        file_name, _ = snapshot.TABLES[name]
+        files = [(os.path.join(directory, file_name), entry)]
+        arrow_path = os.path.join(directory, f"{name}.arrow")
+        if "arrow" in entry:
+            files.append((arrow_path, entry["arrow"]))
+        elif os.path.exists(arrow_path):
+            raise ValueError(f"{arrow_path} is not in the manifest")
+        for path, file in files:
+            if (
+                not os.path.exists(path)
+                or ("size" in file and os.path.getsize(path) != file["size"])
+                or file_hash(path) != file["sha256"]
+            ):
+                raise ValueError(f"{path} does not match the manifest")
+        hashes[name], rows[name] = entry["sha256"], entry["rows"]
+    return (directory, hashes), rows
+
+
+def swap(state: tuple, rows: dict) -> list:
+    """Serve a verified snapshot and get the tables that changed."""
+    _, previous = snapshot.current or (None, {})
+    _, hashes = state
+    changed = [name for name in hashes if previous.get(name) != hashes[name]]
+
+    # Read the changed tables before the swap, so sessions find them cached
+    snapshot.pin(state)
+    try:
+        for name in changed:
+            if len(snapshot.load_table(name)) != rows[name]:
+                raise ValueError(f"{name} does not have {rows[name]} rows")
+    finally:
+        snapshot.pin(snapshot.current)
+    snapshot.current = state
+    return changed
+
+
+def reload() -> Optional[str]:
+    """Swap in the newest complete snapshot, return its directory if it is new."""
+    with _reload_lock:
+        for directory in reversed(published(SNAPSHOT_ROOT)):
+            if snapshot.current and snapshot.current[0] == directory:
+                return None
+            try:
+                state, rows = verify(directory)
+                changed = swap(state, rows)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Skipping snapshot {directory}: {e}")
+                continue
+            logger.info(f"Serving snapshot {directory}, changed: {changed}")
+            return directory
+    return None
+
+
+@st.cache_resource(show_spinner=False)
+def _start_watcher(root: str):
+    # watchdog is only imported when snapshots are served from a directory
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    from watchdog.observers.polling import PollingObserver
+
+    class ManifestHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            path = getattr(event, "dest_path", "") or event.src_path
+            if os.path.basename(path) == MANIFEST:
+                reload()
+
+    os.makedirs(root, exist_ok=True)
+    reload()
+    observer = PollingObserver(POLL_INTERVAL) if POLL_INTERVAL else Observer()
+    observer.daemon = True
+    observer.schedule(ManifestHandler(), root, recursive=True)
+    observer.start()
+    return observer
+
+
+def watch():
+    """Serve the snapshots of KG_SNAPSHOT_ROOT if set, and pin one for this run."""
+    if enabled():
+        _start_watcher(SNAPSHOT_ROOT)
+    snapshot.pin()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Publish the data as a snapshot")
+    parser.add_argument(
+        "root",
+        nargs="?",
+        default=SNAPSHOT_ROOT,
+        help="Directory of the snapshots (default: KG_SNAPSHOT_ROOT)",
+    )
+    parser.add_argument(
+        "--data", default=snapshot.DATA_DIR, help="Data directory to publish"
+    )
+    parser.add_argument(
+        "--keep", type=int, default=KEEP, help="Number of snapshots to keep"
+    )
+    args = parser.parse_args()
+    if not args.root:
+        parser.error("the snapshot directory is required")
+
+    print(f"Published {publish(args.root, args.data, args.keep)}")
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""Headline statistics of the KG (node, edge and per-label counts).
+
+All counts are read in a single round trip from the Neo4j count store through
+`apoc.meta.stats`, so the cost grows with the number of labels and relationship
+types instead of with the size of the graph. Labels that should not show up in
+the dashboard are removed afterwards in Python.
+"""
+import pandas as pd
+
+# Nodes of these labels are internal and not part of the KG
+EXCLUDED_LABELS = ["_Neodash_Dashboard"]
+
+# Labels that are not listed in the node statistics of the dashboard
+HIDDEN_LABELS = EXCLUDED_LABELS + ["SkillGroup"]
+
+STATS_QUERY = """CALL apoc.meta.stats() YIELD nodeCount, relCount, labels
+RETURN nodeCount, relCount, labels"""
+
+
+def fetch_stats(graph) -> dict:
+    """Get the node, edge and label counts of the KG"""
+    return graph.run(STATS_QUERY).data()[0]
+
+
+def stats_tables(stats: dict) -> dict:
+    """Convert the statistics to the snapshot tables (table name -> data frame).
+
+    The column names match the ones of the former Cypher queries, so the
+    snapshot files keep their layout.
+    """
+    label_counts = stats["labels"]
+    node_count = stats["nodeCount"] - sum(
+        label_counts.get(label, 0) for label in EXCLUDED_LABELS
+    )
+    node_stats = [
+        (label, count)
+        for label, count in label_counts.items()
+        if label not in HIDDEN_LABELS and count > 0
+    ]
+
+    return {
+        "nodes": pd.DataFrame({"COUNT(n)": [node_count]}),
+        "edges": pd.DataFrame({"COUNT(distinct r)": [stats["relCount"]]}),
+        "node_stats": pd.DataFrame(node_stats, columns=["Nodes", "Counts"]),
+    }
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""Live mode: serve the tables directly from the KG instead of the snapshot.
+
+Live mode is enabled by setting KG_LIVE_URL (e.g. bolt://kg.example.org:7687)
+together with KG_LIVE_USER and KG_LIVE_PASSWORD. The tables are then fetched
+with the CYPHER queries of queries.py through a connection pool shared by all
+sessions (KG_LIVE_CONNECTIONS connections). Each result is cached for the time
+to live of its query (KG_LIVE_TTL seconds by default, see TTL), and concurrent
+sessions asking for the same table while it is fetched wait for that single
+query instead of sending their own.
+
+When the KG cannot be reached, the last result fetched from the KG is used, or
+the snapshot file if there is none, and the KG is not contacted again for
+KG_LIVE_RETRY seconds. Tables that are not in the KG (e.g. the clinical
+expertise) are always read from the snapshot. Live mode needs the packages of
+requirements-export.txt.
+"""
+import io
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+import pandas as pd
+import streamlit as st
+
+import kg_stats
+import snapshot
+
+LIVE_URL = os.environ.get("KG_LIVE_URL")
+USERNAME = os.environ.get("KG_LIVE_USER", "neo4j")
+PASSWORD = os.environ.get("KG_LIVE_PASSWORD", "")
+CONNECTIONS = int(os.environ.get("KG_LIVE_CONNECTIONS", "4"))
+DEFAULT_TTL = float(os.environ.get("KG_LIVE_TTL", "300"))
+RETRY_AFTER = float(os.environ.get("KG_LIVE_RETRY", "30"))
+
+# Time to live (in seconds) of the queries that differ from the default. The
+# KG statistics are read from the count store, so they can be refreshed often.
+TTL = {"kg_stats": 60}
+
+# Tables computed from the result of the KG statistics query
+STATS_TABLES = ("nodes", "edges", "node_stats")
+
+logger = logging.getLogger(__name__)
+
+# Last table fetched from the KG (table name -> (frame, version)) and the time
+# until which the KG is considered unreachable
+_last_tables = {}
+_unavailable_until = 0.0
+_state_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    """Check whether live mode is configured."""
+    return bool(LIVE_URL)
+
+
+@st.cache_resource(show_spinner=False)
+def _table_queries() -> dict:
+    # The export dependencies (py2neo) are only imported in live mode
+    import queries
+
+    return {table: query for table, query, _ in queries.table_queries()}
+
+
+@st.cache_resource(show_spinner=False)
+def _graph(url: str, username: str):
+    import queries
+
+    return queries.connect_to_kg(
+        url=url, username=username, password=PASSWORD, max_connections=CONNECTIONS
+    )
+
+
+def query_name(table: str) -> Optional[str]:
+    """Get the name of the query a table is fetched with, None if it is not live."""
+    if table in STATS_TABLES:
+        return "kg_stats"
+    return table if table in _table_queries() else None
+
+
+def _version(df: pd.DataFrame) -> str:
+    return str(pd.util.hash_pandas_object(df, index=True).sum())
+
+
+def _parse(table: str, df: pd.DataFrame) -> pd.DataFrame:
+    # Parse the records like the exported CSV file, so a live table has the same
+    # columns and types as the snapshot table
+    _, read_kwargs = snapshot.TABLES[table]
+    return pd.read_csv(io.StringIO(df.to_csv(index=False)), **read_kwargs)
+
+
+@st.cache_resource(show_spinner=False, max_entries=2 * len(snapshot.TABLES))
+def _fetch(name: str, period: int) -> dict:
+    """Run a query; the period of its time to live is only part of the cache key."""
+    graph = _graph(LIVE_URL, USERNAME)
+    if name == "kg_stats":
+        frames = kg_stats.stats_tables(kg_stats.fetch_stats(graph))
+    else:
+        frames = {name: graph.run(_table_queries()[name]).to_data_frame()}
+
+    tables = {}
+    for table, df in frames.items():
+        df = _parse(table, df)
+        tables[table] = df, _version(df)
+    return tables
+
+
+def get_table(table: str) -> Optional[tuple]:
+    """Get a table from the KG as (frame, version), None to use the snapshot."""
+    global _unavailable_until
+
+    name = query_name(table)
+    if name is None:
+        return None
+    if time.monotonic() < _unavailable_until:
+        return _last_tables.get(table)
+
+    ttl = TTL.get(name, DEFAULT_TTL)
+    try:
+        result = _fetch(name, int(time.time() // ttl))[table]
+    except Exception as e:  # Any failure of the KG falls back to the snapshot
+        with _state_lock:
+            if time.monotonic() >= _unavailable_until:
+                logger.warning(f"KG unavailable, using the snapshot: {e}")
+            _unavailable_until = time.monotonic() + RETRY_AFTER
+        return _last_tables.get(table)
+
+    _last_tables[table] = result
+    return result
+
+
+def install():
+    """Serve the snapshot tables from the KG if live mode is configured."""
+    if not enabled():
+        return
+    try:
+        _table_queries()
+    except ImportError as e:
+        logger.error(f"Live mode needs requirements-export.txt: {e}")
+        return
+    snapshot.backend = get_table
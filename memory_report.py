@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""Memory used by the dashboard per session.
+
+Every tab of the dashboard is run headless (streamlit.testing) in new sessions
+of the same process, like concurrent visitors of one server. The first run
+fills the caches shared by all sessions; the following runs only allocate what
+a session needs for itself, e.g. copies of the snapshot tables it modifies and
+the elements sent to the browser. The report shows the memory retained by the
+shared caches and the peak memory of a session with warm caches, which is what
+every concurrent session adds:
+
+    python memory_report.py --sessions 5
+    KG_DATA_DIR=synthetic/x10 python memory_report.py --output memory.json
+
+With `--baseline`, another revision of the dashboard is checked out (with git)
+to a temporary directory and measured the same way on the current data, in a
+separate process, and both reports are shown side by side. Revisions that show
+all tabs on every run measure the whole page for each tab, and the first
+revision downloads the map shapes, so it needs network access:
+
+    python memory_report.py --baseline 84f48fd^
+"""
+import argparse
+import gc
+import glob
+import json
+import logging
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import tracemalloc
+
+import streamlit.logger
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest, local_script_runner
+
+TABS = [
+    "Project Information",
+    "Drug Discovery Expertise",
+    "Clinical Trials Expertise",
+    "Standard Operating Expertise",
+]
+
+
+def run_session(tab: str) -> tuple:
+    """Run a tab in a new session and get its (retained, peak) memory in bytes."""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+
+    app = AppTest.from_file("dashboard.py", default_timeout=600)
+    app.session_state["tab"] = tab
+    app.run()
+    assert not app.exception, [e.value for e in app.exception]
+
+    peak = tracemalloc.get_traced_memory()[1] - before
+    del app
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0] - before, peak
+
+
+def measure(sessions: int) -> dict:
+    """Get the shared and per-session memory of every tab."""
+    # A server compiles the script once for all sessions, AppTest on every run
+    script_cache = ScriptCache()
+    local_script_runner.ScriptCache = lambda: script_cache
+
+    tracemalloc.start()
+    try:
+        report = {}
+        for tab in TABS:
+            # The first session fills the caches
+            shared, _ = run_session(tab)
+            peaks = [run_session(tab)[1] for _ in range(sessions)]
+            report[tab] = {"shared": shared, "session_peak": statistics.median(peaks)}
+    finally:
+        tracemalloc.stop()
+    return report
+
+
+def measure_revision(revision: str, sessions: int) -> dict:
+    """Measure a git revision of the dashboard on the current data."""
+    repo = os.path.dirname(os.path.abspath(__file__))
+    data_dir = os.environ.get("KG_DATA_DIR", "data")
+    with tempfile.TemporaryDirectory() as tree:
+        archive = os.path.join(tree, "revision.tar")
+        subprocess.run(
+            ["git", "archive", "-o", archive, revision], cwd=repo, check=True
+        )
+        with tarfile.open(archive) as tar:
+            tar.extractall(tree, filter="data")
+        for path in glob.glob(os.path.join(data_dir, "*.csv")):
+            shutil.copy(path, os.path.join(tree, "data"))
+        shutil.copy(os.path.abspath(__file__), tree)
+
+        output = os.path.join(tree, "memory.json")
+        env = {
+            **os.environ,
+            "KG_DATA_DIR": os.path.join(tree, "data"),
+            "KG_CACHE_DIR": os.path.join(tree, "cache"),
+        }
+        subprocess.run(
+            [
+                sys.executable,
+                os.path.basename(__file__),
+                "--sessions",
+                str(sessions),
+                "--output",
+                output,
+            ],
+            cwd=tree,
+            env=env,
+            check=True,
+        )
+        with open(output) as f:
+            return json.load(f)["current"]
+
+
+def _mb(memory: dict, key: str) -> str:
+    return f"{memory[key] / 2**20:8.2f}MB"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report the memory per session")
+    parser.add_argument(
+        "--sessions", type=int, default=3, help="Number of sessions with warm caches"
+    )
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    parser.add_argument(
+        "--baseline", help="Git revision to measure as well, e.g. a commit or tag"
+    )
+    args = parser.parse_args()
+
+    report = {"current": None}
+    if args.baseline:
+        report["baseline_revision"] = args.baseline
+        report["baseline"] = measure_revision(args.baseline, args.sessions)
+
+    # Running the dashboard outside of `streamlit run` logs warnings
+    streamlit.logger.set_log_level(logging.ERROR)
+
+    report["current"] = measure(args.sessions)
+    header = f"{'tab':<30} {'shared':>10} {'per session':>12}"
+    if args.baseline:
+        header += f"   baseline {'shared':>10} {'per session':>12}"
+    print(header)
+    for tab, memory in report["current"].items():
+        line = f"{tab:<30} {_mb(memory, 'shared')}   {_mb(memory, 'session_peak')}"
+        if args.baseline:
+            before = report["baseline"][tab]
+            line += f"            {_mb(before, 'shared')}   "
+            line += _mb(before, "session_peak")
+        print(line)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""Opt-in timing of the dashboard sections.
+
+Profiling is enabled for all sessions with the KG_PROFILE=1 environment
+variable, or for a single session by opening the dashboard with `?profile=1`.
+The time of each named section is split into loading snapshot tables, sending
+elements to the browser (e.g. serializing Plotly figures) and the remaining
+computation. The results of a script run are shown in a collapsible panel at
+the end of the page and appended to a JSON lines log (KG_PROFILE_LOG).
+
+Panels that are fragments use the `fragment` decorator instead of st.fragment:
+a fragment rerun only runs the panel, so it is profiled as a run of its own and
+its results are shown at the end of the panel.
+
+When profiling is disabled, the helpers only check a flag, so the sections can
+stay instrumented.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+LOG_PATH = os.environ.get("KG_PROFILE_LOG", os.path.join("logs", "profile.jsonl"))
+
+# Kinds of time that are measured separately, the rest of a section is "compute"
+TIMED_KINDS = ("load", "render")
+
+# Each session runs the script in its own thread
+_state = threading.local()
+_log_lock = threading.Lock()
+
+
+def _env_enabled() -> bool:
+    return os.environ.get("KG_PROFILE", "").lower() in ("1", "true", "yes")
+
+
+def start():
+    """Start profiling a script run if enabled by the environment or the URL."""
+    query_value = st.query_params.get("profile", "")
+    _state.enabled = _env_enabled() or query_value.lower() in ("1", "true", "yes")
+    _state.sections = []
+    _state.stack = []
+    _state.start = time.perf_counter()
+
+
+def enabled() -> bool:
+    """Check whether the current script run is profiled."""
+    return getattr(_state, "enabled", False)
+
+
+@contextmanager
+def section(name: str):
+    """Time a named section of the page."""
+    if not enabled():
+        yield
+        return
+
+    record = {"section": name, "load": 0.0, "render": 0.0}
+    _state.stack.append(record)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record["total"] = time.perf_counter() - start
+        record["compute"] = record["total"] - record["load"] - record["render"]
+        _state.stack.pop()
+        _state.sections.append(record)
+
+
+@contextmanager
+def timer(kind: str):
+    """Attribute the time of a block to the given kind of the current section.
+
+    Nested timers only count once, for the outermost kind.
+    """
+    if not enabled() or not _state.stack or getattr(_state, "timing", False):
+        yield
+        return
+
+    assert kind in TIMED_KINDS, "Invalid kind of time"
+    _state.timing = True
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _state.stack[-1][kind] += time.perf_counter() - start
+        _state.timing = False
+
+
+def _fragment_rerun() -> bool:
+    ctx = get_script_run_ctx()
+    return bool(ctx and ctx.fragment_ids_this_run)
+
+
+def fragment(func):
+    """Turn a panel into a fragment (st.fragment) that is profiled on reruns.
+
+    In a full script run, the panel is part of the profile of the run.
+    """
+
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        if not _fragment_rerun():
+            return func(*args, **kwargs)
+        start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            report()
+
+    return st.fragment(run)
+
+
+def plotly_chart(figure, **kwargs):
+    """Show a Plotly figure, timing its serialization as render time."""
+    with timer("render"):
+        return st.plotly_chart(figure, **kwargs)
+
+
+def append_log(sections: list, total: float):
+    """Append the profile of a script run to the log file."""
+    entry = {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "total": round(total, 6),
+        "sections": [
+            {key: round(v, 6) if isinstance(v, float) else v for key, v in s.items()}
+            for s in sections
+        ],
+    }
+    try:
+        with _log_lock:
+            os.makedirs(os.path.dirname(LOG_PATH) or ".", exist_ok=True)
+            with open(LOG_PATH, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+    except OSError:
+        pass  # The log is optional (e.g. read-only file system)
+
+
+def report():
+    """Show the profile of the script run and append it to the log."""
+    if not enabled():
+        return
+
+    total = time.perf_counter() - _state.start
+    append_log(_state.sections, total)
+
+    df = pd.DataFrame(
+        _state.sections,
+        columns=["section", "load", "compute", "render", "total"],
+    )
+    with st.expander(f"Profile of this run ({total * 1000:.0f} ms)"):
+        st.dataframe(
+            (df.set_index("section") * 1000).round(1),
+            column_config={
+                kind: st.column_config.NumberColumn(f"{kind} (ms)")
+                for kind in ("load", "compute", "render", "total")
+            },
+            use_container_width=True,
+        )
+        st.caption(f"Appended to {LOG_PATH}")
@@ -1,12 +1,38 @@
 # -*- coding: utf-8 -*-
+import argparse
+import csv
+import filecmp
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from tqdm import tqdm
-from py2neo import Graph
+from py2neo import Graph, Transaction
+from py2neo.client import Connection
+
+import kg_stats
+from snapshot import columnar_path, write_columnar
+
+# Default number of queries sent to the KG at the same time
+DEFAULT_WORKERS = 4
+
+# Label declaration for queries that read the whole graph
+ALL_LABELS = "*"
+
+# Number of records pulled from the KG and written to the CSV file at once
+BATCH_SIZE = 10_000
+
+# Fingerprints of the last export, used by the incremental mode
+FINGERPRINT_FILE = "./data/fingerprints.json"
 
 
-def connect_to_kg(url, username, password):
+def connect_to_kg(url, username, password, max_connections=None):
     graph = Graph(
         url,
         auth=(username, password),
+        max_size=max_connections,
     )
     return graph
 
@@ -33,24 +59,6 @@ def get_wp_info():
     COUNT(distinct n) as Organizations"""
 
 
-def get_node_counts():
-    return """MATCH (n)
-    WHERE not n.name = '_Neodash_Dashboard'
-    RETURN COUNT(n)"""
-
-
-def get_edge_counts():
-    return """MATCH (n)-[r]-(t)
-    RETURN COUNT(distinct r)"""
-
-
-def get_node_stats():
-    return """CALL db.labels() YIELD label
-    CALL apoc.cypher.run('MATCH (:`'+label+'`) RETURN count(*) as count',{}) YIELD value
-    WHERE NOT label IN ['_Neodash_Dashboard', 'SkillGroup']
-    RETURN label as Nodes, value.count as Counts"""
-
-
 def get_skill_group():
     return """MATCH (n:SkillGroup)
     RETURN n.name as SkillGroup"""
@@ -89,21 +97,55 @@ def get_all_target_classes():
     RETURN t.name as Target, t.curie as Curie"""
 
 
+# Named queries that take their values as $parameters. The query text is the
+# same for every value, so Neo4j compiles each query once and serves repeated
+# lookups from its plan cache (and quotes in names need no escaping).
+NAMED_QUERIES = {
+    # Partners and individuals of a single technology ($name)
+    "tech_info": """MATCH path=(e)-[q]->(i: Partner)<-[]-(p:Person)
+    WHERE e.name = $name
+    WITH e, nodes(path) as no
+    WITH e, no, last(no) as leaf
+    WITH e, [n IN no[..-1] | n.name] AS Partner, count(distinct leaf.name) as Percentage
+    RETURN e.name as Name, Partner[0] as info, Partner[1] as Partner, Percentage""",
+    # Same as tech_info for a list of technologies ($names) in one round trip
+    "tech_info_batch": """UNWIND $names as name
+    MATCH path=(e)-[q]->(i: Partner)<-[]-(p:Person)
+    WHERE e.name = name
+    WITH e, nodes(path) as no
+    WITH e, no, last(no) as leaf
+    WITH e, [n IN no[..-1] | n.name] AS Partner, count(distinct leaf.name) as Percentage
+    RETURN e.name as Name, Partner[0] as info, Partner[1] as Partner, Percentage""",
+}
+
+# Labels cannot be passed as parameters, so there is one fixed query per class
+TECH_DATA_QUERIES = {
+    class_type: f"""MATCH path=(e: {class_type})-[q]->(i: Partner)<-[]-(p:Person)
+    RETURN e.name as Name, p.name as info, i.name as Partner"""
+    for class_type in ["Software", "Experiment", "TargetClass"]
+}
+
+
+def run_query(query: str, parameters: dict = None, source=None):
+    """Run a CYPHER query with its parameters on `source`, the graph or an open
+    transaction (the graph by default)"""
+    return (source or graph).run(query, parameters or {})
+
+
 def get_tech_info(name: str):
-    """Get the technology information. The name could be software, assay, or target class"""
-    return f"""MATCH path=(e)-[q]->(i: Partner)<-[]-(p:Person)
-    WHERE e.name = '{name}' 
-    WITH nodes(path) as no
-    WITH no, last(no) as leaf
-    WITH  [n IN no[..-1] | n.name] AS Partner, count(distinct leaf.name) as Percentage
-    RETURN e.name, Partner[0] as info, Partner[1] as Partner, Percentage"""
+    """Get the technology information query and its parameters. The name could be software, assay, or target class"""
+    return NAMED_QUERIES["tech_info"], {"name": name}
+
+
+def get_tech_infos(names):
+    """Get the technology information query and its parameters for several software, assays or target classes at once"""
+    return NAMED_QUERIES["tech_info_batch"], {"names": list(names)}
 
 
 def get_tech_data(class_type: str):
     """Get the technology information. The name could be software, assay, or target class"""
-    assert class_type in ["Software", "Experiment", "TargetClass"], "Invalid class type"
-    return f"""MATCH path=(e: {class_type})-[q]->(i: Partner)<-[]-(p:Person)
-    RETURN e.name as Name, p.name as info, i.name as Partner"""
+    assert class_type in TECH_DATA_QUERIES, "Invalid class type"
+    return TECH_DATA_QUERIES[class_type]
 
 
 def get_partner_info():
@@ -132,41 +174,352 @@ def get_sops():
     RETURN so.id as ID, so.category as Category, so.type as Type, so.name as Title, so.doi as DOI, so.keywords as Keywords, so.creators as Creator, so.reviewers as Reviewer"""
 
 
-def run_all_queries():
-    """Run all CYPHER queries and return the results in a dictionary"""
-    queries = [
-        ("location", get_location()),
-        ("organization", get_organization_info()),
-        ("wp", get_wp_info()),
-        ("nodes", get_node_counts()),
-        ("edges", get_edge_counts()),
-        ("node_stats", get_node_stats()),
-        ("skillgroups", get_skill_group()),
-        ("skills", skill_distribution()),
-        ("skills_metadata", skill_metadata()),
-        ("skills_info", get_skill_info()),
-        ("assays", get_all_assays()),
-        ("software", get_all_software()),
-        ("target_class", get_all_target_classes()),
-        ("partner_info", get_partner_info()),
-        ("person_info", get_person_info()),
-        ("partner_data", get_all_partner_relationships()),
-        ("software_data", get_tech_data("Software")),
-        ("assay_data", get_tech_data("Experiment")),
-        ("target_data", get_tech_data("TargetClass")),
-        ("so_categories", get_sop_categories()),
-        ("standard_operations", get_sops())
+def get_labels():
+    return """CALL db.labels() YIELD label
+    RETURN label"""
+
+
+def get_label_fingerprint(label: str):
+    """Cheap change marker for a label: node count, total degree, property hash and
+    hash of the relationships (type and endpoints) of its nodes"""
+    label = label.replace("`", "``")
+    return f"""MATCH (n:`{label}`)
+    WITH n ORDER BY id(n)
+    WITH count(n) as nodes, sum(apoc.node.degree(n)) as degree, apoc.util.md5(collect(properties(n))) as content
+    CALL {{
+        MATCH (:`{label}`)-[r]-()
+        WITH DISTINCT r ORDER BY id(r)
+        RETURN apoc.util.md5(collect([type(r), id(startNode(r)), id(endNode(r))])) as relationships
+    }}
+    RETURN nodes, degree, content, relationships"""
+
+
+def fingerprint_labels(labels, workers: int = DEFAULT_WORKERS, source=None):
+    """Get the fingerprint of each label as a string"""
+    source = source or graph
+
+    def fingerprint(label):
+        record = source.run(get_label_fingerprint(label)).data()[0]
+        return json.dumps(record, sort_keys=True, default=str)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return dict(zip(labels, executor.map(fingerprint, labels)))
+
+
+def output_fingerprint(query: str, labels, label_fingerprints: dict):
+    """Combine the query text and the fingerprints of the labels it reads"""
+    digest = hashlib.sha256(query.encode("utf-8"))
+    for label in sorted(labels):
+        digest.update(f"{label}={label_fingerprints[label]}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def write_csv(df, path: str):
+    """Save a data frame as CSV, leaving the file untouched if nothing changed"""
+    content = df.to_csv(index=False)
+    if os.path.exists(path):
+        with open(path, newline="") as f:
+            if f.read() == content:
+                return False
+
+    with open(path, "w", newline="") as f:
+        f.write(content)
+    return True
+
+
+def export_table(file_name: str, df):
+    """Save a table as CSV and refresh its Arrow copy if needed"""
+    if write_csv(df, f"./data/{file_name}.csv") or not os.path.exists(
+        columnar_path(file_name)
+    ):
+        write_columnar(file_name)
+
+
+def pull_batches(source, query: str, parameters: dict = None):
+    """Run a query and get its fields and an iterator over batches of records.
+
+    The `run` methods of py2neo pull the whole result from the KG before they
+    return. Here the records are pulled BATCH_SIZE at a time (flow control of
+    Bolt 4, Neo4j 4.0 and later, which the export queries need anyway), so only
+    one batch is held in memory. The query runs in the transaction `source`, or
+    in a read transaction of its own if `source` is the graph; that transaction
+    ends with the last batch.
+    """
+    tx = source if isinstance(source, Transaction) else source.begin(readonly=True)
+    own_tx = tx is not source
+    # py2neo has no public API for pulling part of a result, so this relies on
+    # the internals of the version pinned in requirements-export.txt
+    connector = tx._connector
+    hydrant = Connection.default_hydrant(connector.profile, tx.graph)
+
+    try:
+        result = connector.run(tx.ref, query, parameters or {})
+        connector.pull(result, n=BATCH_SIZE)
+        fields = result.fields()
+    except BaseException:
+        if own_tx:
+            tx.graph.rollback(tx)
+        raise
+
+    def batches():
+        try:
+            while True:
+                batch = []
+                while (values := result.take()) is not None:
+                    batch.append(hydrant.hydrate_list(values))
+                if batch:
+                    yield batch
+                if not result.has_more_records():
+                    break
+                connector.pull(result, n=BATCH_SIZE)
+        except BaseException:
+            if own_tx:
+                tx.graph.rollback(tx)
+            raise
+        if own_tx:
+            tx.graph.commit(tx)
+
+    return fields, batches()
+
+
+def stream_csv(fields, batches, path: str):
+    """Write batches of records to a CSV file, one batch at a time.
+
+    The file is written next to the target and only replaces it if the content
+    changed. Returns whether the file changed, the number of rows and the number
+    of bytes written.
+    """
+    tmp_path = f"{path}.tmp"
+    rows = 0
+    with open(tmp_path, "w", newline="") as f:
+        writer = csv.writer(f, lineterminator=os.linesep)
+        writer.writerow(fields)
+        for batch in batches:
+            writer.writerows(batch)
+            rows += len(batch)
+        size = f.tell()
+
+    if os.path.exists(path) and filecmp.cmp(tmp_path, path, shallow=False):
+        os.remove(tmp_path)
+        return False, rows, size
+    os.replace(tmp_path, path)
+    return True, rows, size
+
+
+def export_query(file_name: str, query: str, source=None, parameters: dict = None):
+    """Run a single CYPHER query and stream the result to CSV (and Arrow).
+
+    The query runs with its `parameters` on `source`, the graph or an open
+    transaction (the graph by default). Returns the wall time, the number of rows and the size of the CSV
+    file.
+    """
+    start = time.perf_counter()
+    fields, batches = pull_batches(source or graph, query, parameters)
+    changed, rows, size = stream_csv(fields, batches, f"./data/{file_name}.csv")
+    if changed or not os.path.exists(columnar_path(file_name)):
+        write_columnar(file_name)
+    return time.perf_counter() - start, rows, size
+
+
+def export_stats(source=None):
+    """Save the node, edge and label counts of the KG and return the wall time"""
+    start = time.perf_counter()
+    stats = kg_stats.fetch_stats(source or graph)
+    for file_name, df in kg_stats.stats_tables(stats).items():
+        export_table(file_name, df)
+    return time.perf_counter() - start
+
+
+def table_queries():
+    """Get the (table name, CYPHER query, labels read) of every exported table"""
+    return [
+        ("location", get_location(), ["Partner"]),
+        ("organization", get_organization_info(), ["Person", "Partner"]),
+        ("wp", get_wp_info(), ["Partner", "Person", "WorkPackage"]),
+        ("skillgroups", get_skill_group(), ["SkillGroup"]),
+        ("skills", skill_distribution(), ["SkillGroup", "Skill", "Person"]),
+        ("skills_metadata", skill_metadata(), ["SkillGroup", "Skill"]),
+        (
+            "skills_info",
+            get_skill_info(),
+            ["SkillGroup", "Skill", "Person", "Partner"],
+        ),
+        ("assays", get_all_assays(), ["Experiment"]),
+        ("software", get_all_software(), ["Software"]),
+        ("target_class", get_all_target_classes(), ["TargetClass"]),
+        ("partner_info", get_partner_info(), ["Partner"]),
+        ("person_info", get_person_info(), ["Person", "Partner"]),
+        ("partner_data", get_all_partner_relationships(), ALL_LABELS),
+        (
+            "software_data",
+            get_tech_data("Software"),
+            ["Software", "Partner", "Person"],
+        ),
+        (
+            "assay_data",
+            get_tech_data("Experiment"),
+            ["Experiment", "Partner", "Person"],
+        ),
+        (
+            "target_data",
+            get_tech_data("TargetClass"),
+            ["TargetClass", "Partner", "Person"],
+        ),
+        ("so_categories", get_sop_categories(), ["StandardOperationCategory"]),
+        ("standard_operations", get_sops(), ["StandardOperation"])
     ]
 
+
+def run_all_queries(
+    workers: int = DEFAULT_WORKERS,
+    incremental: bool = False,
+    transaction: bool = False,
+):
+    """Run all CYPHER queries and save the results to CSV files.
+
+    Up to `workers` queries run concurrently, each writing its own file, so the
+    output does not depend on the order in which the queries finish. Results are
+    streamed to the CSV files in batches, so memory use does not grow with the
+    result size. The wall time, rows/s and bytes written of each query are
+    reported in the order of the query list.
+
+    Each query declares the labels it reads (ALL_LABELS for queries over the
+    whole graph). In incremental mode, a query is only re-run if the fingerprint
+    of one of its labels (or the query itself) changed since the last export.
+    The labels are only fingerprinted in incremental mode, as this reads the
+    whole graph; other exports remove the stored fingerprints.
+
+    In transaction mode, all queries (including the fingerprints and the KG
+    statistics) run one after another in a single read transaction on one
+    connection. The tables then form a consistent snapshot of the KG even if it
+    is written to during the export, and the queries do not each pay for their
+    own auto-commit transaction.
+    """
+    queries = table_queries()
+    start = time.perf_counter()
+    source = graph.begin(readonly=True) if transaction else graph
+    if transaction:
+        # A transaction runs one query at a time
+        workers = 1
+    try:
+        timings, stats_time = _export(queries, source, workers, incremental)
+    except BaseException:
+        if transaction:
+            graph.rollback(source)
+        raise
+    if transaction:
+        graph.commit(source)
+    elapsed = time.perf_counter() - start
+
+    for file_name, _, _ in queries:
+        if file_name in timings:
+            seconds, rows, size = timings[file_name]
+            print(
+                f"{file_name:<20} {seconds:8.2f}s {rows:>9} rows "
+                f"{rows / max(seconds, 1e-9):>10.0f} rows/s {size / 1e6:8.2f} MB"
+            )
+        else:
+            print(f"{file_name:<20} {'unchanged':>9}")
+    print(f"{'kg_stats':<20} {stats_time:8.2f}s")
+    if transaction:
+        rows = sum(rows for _, rows, _ in timings.values())
+        print(
+            f"{'transaction':<20} {elapsed:8.2f}s {rows:>9} rows "
+            f"{rows / max(elapsed, 1e-9):>10.0f} rows/s "
+            f"({len(timings) + 1} queries)"
+        )
+    print(f"{'total':<20} {elapsed:8.2f}s")
+    return timings
+
+
+def _export(queries, source, workers: int, incremental: bool):
+    stale = [(file_name, query) for file_name, query, _ in queries]
+    if incremental:
+        stale, fingerprints = _stale_queries(queries, source, workers)
+
     # Save the data to CSV files
-    for file_name, query in tqdm(queries):
-        df = graph.run(query).to_data_frame()
-        df.to_csv(f"./data/{file_name}.csv", index=False)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {
+            file_name: executor.submit(export_query, file_name, query, source)
+            for file_name, query in stale
+        }
+        # The KG statistics are read from the count store, so they are cheap
+        # enough to refresh on every export
+        stats_future = executor.submit(export_stats, source)
+        timings = {
+            file_name: future.result() for file_name, future in tqdm(futures.items())
+        }
+        stats_time = stats_future.result()
+
+    if incremental:
+        with open(FINGERPRINT_FILE, "w") as f:
+            json.dump(fingerprints, f, indent=2, sort_keys=True)
+    elif os.path.exists(FINGERPRINT_FILE):
+        # The files no longer match the stored fingerprints, so the next
+        # incremental export has to re-run all queries
+        os.remove(FINGERPRINT_FILE)
+    return timings, stats_time
+
+
+def _stale_queries(queries, source, workers: int):
+    # Fingerprint the labels and keep the queries whose input changed. Returns
+    # the stale (file name, query) pairs and the fingerprints after the export.
+    all_labels = sorted(source.run(get_labels()).to_data_frame()["label"])
+    queries = [
+        (file_name, query, all_labels if labels == ALL_LABELS else labels)
+        for file_name, query, labels in queries
+    ]
+    used_labels = sorted({label for _, _, labels in queries for label in labels})
+    label_fingerprints = fingerprint_labels(used_labels, workers, source)
+    fingerprints = {
+        file_name: output_fingerprint(query, labels, label_fingerprints)
+        for file_name, query, labels in queries
+    }
+
+    previous = {}
+    if os.path.exists(FINGERPRINT_FILE):
+        with open(FINGERPRINT_FILE) as f:
+            previous = json.load(f)
+
+    stale = [
+        (file_name, query)
+        for file_name, query, _ in queries
+        if previous.get(file_name) != fingerprints[file_name]
+        or not os.path.exists(f"./data/{file_name}.csv")
+    ]
+    return stale, {**previous, **fingerprints}
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the KG data to CSV files")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Maximum number of queries sent to the KG at the same time",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-run the queries whose labels changed since the last export",
+    )
+    parser.add_argument(
+        "--transaction",
+        action="store_true",
+        help="Run all queries one after another in a single read transaction, "
+        "so the files form a consistent snapshot of the KG",
+    )
+    args = parser.parse_args()
+
     graph = connect_to_kg(
-        url="bolt://localhost:7687", username="neo4j", password="password"
+        url="bolt://localhost:7687",
+        username="neo4j",
+        password="password",
+        max_connections=args.workers,
     )  #
-    run_all_queries()
+    run_all_queries(
+        workers=args.workers,
+        incremental=args.incremental,
+        transaction=args.transaction,
+    )
     print("Data has been successfully saved to CSV files.")
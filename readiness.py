@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Readiness check of a dashboard server.
+
+The server writes a marker file when it has loaded the baked bundle (see
+artifacts.py). The check passes once the health endpoint of the server answers
+and the marker shows that the running server has loaded the bundle of the
+latest bake:
+
+    python readiness.py --url http://localhost:8501/_stcore/health
+
+It runs every few seconds as health check of the Docker image, so it only uses
+the standard library and reads two small JSON files.
+"""
+import argparse
+import json
+import os
+import sys
+import urllib.request
+from typing import Optional
+
+BUNDLE_DIR = os.path.join(os.environ.get("KG_CACHE_DIR", "cache"), "bundle")
+
+# Points to the bundle file of the latest bake
+MANIFEST_PATH = os.path.join(BUNDLE_DIR, "manifest.json")
+
+# Written by the server that loaded the bundle
+LOADED_PATH = os.path.join(BUNDLE_DIR, "loaded.json")
+
+
+def _read_json(path: str) -> Optional[dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def check(health_url: Optional[str] = None) -> list:
+    """Get the reasons why the dashboard is not ready to serve (empty if ready)."""
+    problems = []
+    if health_url:
+        try:
+            with urllib.request.urlopen(health_url, timeout=5) as response:
+                if response.status != 200:
+                    problems.append(f"Health check returned {response.status}")
+        except OSError as e:
+            problems.append(f"Health check failed: {e}")
+
+    manifest = _read_json(MANIFEST_PATH)
+    if manifest is None:
+        problems.append(f"No bundle in {BUNDLE_DIR}")
+        return problems
+
+    loaded = _read_json(LOADED_PATH)
+    if loaded is None or not _running(loaded["pid"]):
+        problems.append("The dashboard has not loaded the bundle")
+    elif loaded["version"] != manifest["version"]:
+        problems.append(f"The dashboard has not loaded bundle {manifest['version']}")
+    elif loaded["snapshot"] not in (None, manifest["version"]):
+        problems.append(f"Bundle {manifest['version']} is outdated")
+    return problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that the dashboard is ready")
+    parser.add_argument(
+        "--url",
+        default=None,
+        help="Health endpoint of the dashboard to include in the check "
+        "(e.g. http://localhost:8501/_stcore/health)",
+    )
+    args = parser.parse_args()
+
+    problems = check(args.url)
+    for problem in problems:
+        print(problem)
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""Inverted indexes for searching the snapshot tables.
+
+An index is built once per snapshot version and shared across sessions. Text
+fields are split into lower-case alphanumeric tokens; a query matches the rows
+that contain every query token (as a prefix of a token, so partial words typed
+into a search box match as well) in any of the searched fields. A query token
+that is not the prefix of any token matches the tokens containing it instead,
+so the end of a word (e.g. "lipidosis" for "phospholipidosis") is found too.
+Matches are ranked by the field weight, term frequency and inverse document frequency of
+the matched terms. Tag fields (e.g. comma separated keywords) are indexed as
+whole values for exact, case-insensitive filtering.
+"""
+import math
+import re
+from bisect import bisect_left
+from collections import defaultdict
+
+import pandas as pd
+import streamlit as st
+
+import artifacts
+import snapshot
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+# Searchable text fields of the SOG/Ps with their weight in the ranking
+SOP_TEXT_FIELDS = {
+    "Title": 3.0,
+    "Keywords": 2.0,
+    "ID": 1.0,
+    "Category": 1.0,
+    "Creator": 1.0,
+    "Reviewer": 1.0,
+}
+
+# Fields of the SOG/Ps holding comma separated values
+SOP_TAG_FIELDS = ("Keywords", "Creator", "Reviewer")
+
+
+def tokenize(text) -> list:
+    """Split a text into lower-case alphanumeric tokens."""
+    if not isinstance(text, str):
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def split_tags(text, separator: str = ",") -> list:
+    """Split a separated list of values into normalized tags."""
+    if not isinstance(text, str):
+        return []
+    return [tag for tag in (t.strip().lower() for t in text.split(separator)) if tag]
+
+
+class InvertedIndex:
+    """Inverted index over the text and tag fields of a table.
+
+    Rows are identified by their position in the table.
+    """
+
+    def __init__(self, df: pd.DataFrame, text_fields: dict, tag_fields=()):
+        self.size = len(df)
+        self.weights = dict(text_fields)
+        # Field -> token -> {row: term frequency}
+        self.postings = {field: defaultdict(dict) for field in text_fields}
+        # Field -> tag -> set of rows
+        self.tags = {field: defaultdict(set) for field in tag_fields}
+
+        for field in text_fields:
+            postings = self.postings[field]
+            for row, text in enumerate(df[field]):
+                for token in tokenize(text):
+                    postings[token][row] = postings[token].get(row, 0) + 1
+        for field in tag_fields:
+            tags = self.tags[field]
+            for row, text in enumerate(df[field]):
+                for tag in split_tags(text):
+                    tags[tag].add(row)
+
+        # Sorted vocabulary of each field for prefix lookups
+        self.terms = {
+            field: sorted(postings) for field, postings in self.postings.items()
+        }
+
+    def _expand(self, field: str, prefix: str):
+        """Get the terms of a field starting with the prefix."""
+        terms = self.terms[field]
+        i = bisect_left(terms, prefix)
+        while i < len(terms) and terms[i].startswith(prefix):
+            yield terms[i]
+            i += 1
+
+    def _infixes(self, field: str, infix: str):
+        """Get the terms of a field containing the text (a scan of all terms)."""
+        return (term for term in self.terms[field] if infix in term)
+
+    def _token_scores(self, token: str, fields) -> dict:
+        scores = self._match_terms(token, fields, self._expand)
+        if not scores:
+            scores = self._match_terms(token, fields, self._infixes)
+        return scores
+
+    def _match_terms(self, token: str, fields, expand) -> dict:
+        scores = defaultdict(float)
+        for field in fields:
+            weight, postings = self.weights[field], self.postings[field]
+            for term in expand(field, token):
+                rows = postings[term]
+                idf = math.log(1 + self.size / len(rows))
+                # Exact matches rank above partial matches
+                boost = weight * idf * (1.0 if term == token else 0.5)
+                for row, frequency in rows.items():
+                    scores[row] += boost * frequency
+        return scores
+
+    def search(self, query: str, fields=None) -> list:
+        """Get the rows matching all tokens of the query, best matches first.
+
+        An empty query matches all rows (in table order).
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return list(range(self.size))
+
+        fields = list(self.weights) if fields is None else fields
+        token_scores = [self._token_scores(token, fields) for token in tokens]
+        # Intersect the posting lists starting with the shortest one
+        token_scores.sort(key=len)
+        scores = dict(token_scores[0])
+        for other in token_scores[1:]:
+            scores = {
+                row: score + other[row] for row, score in scores.items() if row in other
+            }
+            if not scores:
+                break
+        return sorted(scores, key=lambda row: (-scores[row], row))
+
+    def match_tags(self, field: str, tags) -> list:
+        """Get the rows (in table order) having all the given tags in a field."""
+        postings = [self.tags[field].get(tag.strip().lower(), set()) for tag in tags]
+        if not postings:
+            return list(range(self.size))
+
+        postings.sort(key=len)
+        rows = set(postings[0])
+        for other in postings[1:]:
+            rows &= other
+        return sorted(rows)
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _sop_index(standard_operations_version: tuple) -> InvertedIndex:
+    baked = artifacts.lookup(("sop_index",), ["standard_operations"])
+    if baked is not None:
+        return baked
+
+    return InvertedIndex(
+        snapshot.get_standard_operations(), SOP_TEXT_FIELDS, SOP_TAG_FIELDS
+    )
+
+
+def get_sop_index() -> InvertedIndex:
+    """Get the search index of the SOG/Ps (rows of the standard operations table)."""
+    return _sop_index(snapshot.table_signature("standard_operations"))
+
+
+# Entity type -> (snapshot table, name column, detail columns)
+ENTITY_TYPES = {
+    "Person": ("person_info", "Name", ["Partner"]),
+    "Organisation": ("partner_info", "Name", ["acronym"]),
+    "Skill": ("skills_metadata", "Skill", ["SkillGroup", "Curie"]),
+    "Assay": ("assays", "Assay", ["Curie"]),
+    "Software": ("software", "Software", ["Curie"]),
+    "Target class": ("target_class", "Target", ["Curie"]),
+}
+
+# Searchable fields of the entities with their weight in the ranking
+ENTITY_TEXT_FIELDS = {"Name": 3.0, "Details": 1.0}
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _entity_index(*table_versions: tuple) -> tuple:
+    tables = [table for table, _, _ in ENTITY_TYPES.values()]
+    baked = artifacts.lookup(("entity_index",), tables)
+    if baked is not None:
+        return baked
+
+    frames = []
+    for entity_type, (table, name_column, detail_columns) in ENTITY_TYPES.items():
+        df = snapshot.load_table(table)
+        details = df[detail_columns].astype("string").fillna("")
+        frames.append(
+            pd.DataFrame(
+                {
+                    "Type": entity_type,
+                    "Name": df[name_column],
+                    "Details": details.agg(", ".join, axis=1),
+                }
+            )
+        )
+    entities = pd.concat(frames, ignore_index=True)
+    entities = entities.dropna(subset=["Name"]).drop_duplicates(ignore_index=True)
+    return entities, InvertedIndex(entities, ENTITY_TEXT_FIELDS)
+
+
+def get_entity_index() -> tuple:
+    """Get the searchable entities (Type, Name, Details) and their index."""
+    versions = [
+        snapshot.table_signature(table) for table, _, _ in ENTITY_TYPES.values()
+    ]
+    return _entity_index(*versions)
+
+
+def search_entities(query: str, limit: int = 10) -> pd.DataFrame:
+    """Get the best matching people, partners, skills and capabilities.
+
+    The result has the columns Type, Name and Details (e.g. the affiliation of
+    a person or the curie of an assay). An empty query matches nothing.
+    """
+    entities, index = get_entity_index()
+    if not tokenize(query):
+        return entities.iloc[:0]
+    return entities.iloc[index.search(query)[:limit]]
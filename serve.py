@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""Start the dashboard server with the baked bundle loaded.
+
+`streamlit run` only runs dashboard.py when a visitor opens a session, so the
+bundle would only be loaded for the first visitor. This launcher loads it in the
+server process while the server starts, and again when it is re-baked, which
+lets the readiness check (see readiness.py) pass without visitors. The arguments are passed on to
+`streamlit run dashboard.py`:
+
+    python serve.py --server.port=8501 --server.address=0.0.0.0
+"""
+import sys
+import threading
+
+from streamlit.web import cli
+
+import artifacts
+
+if __name__ == "__main__":
+    threading.Thread(
+        target=artifacts.keep_loaded, name="bundle-loader", daemon=True
+    ).start()
+    sys.argv = ["streamlit", "run", "dashboard.py", *sys.argv[1:]]
+    sys.exit(cli.main())
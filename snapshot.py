@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+"""Cached access to the KG data snapshot stored in the data directory.
+
+Every table is parsed once per process and shared across all Streamlit
+sessions. The cache key contains the modification time and size of the file,
+so a refreshed snapshot (e.g. after re-running queries.py) is picked up on the
+next rerun without restarting the app.
+
+Next to each CSV file, the snapshot can hold a typed columnar copy in the Arrow
+IPC format (`<table>.arrow`, written by the export or by running this module).
+These files are memory-mapped instead of parsed and are used whenever they are
+at least as recent as the CSV file; otherwise the CSV file is read.
+
+The parsed frames are shared by all sessions, but every call returns a lazy
+copy of the shared frame (pandas Copy-on-Write, enabled for the whole process
+by importing this module): the copy shares the memory of the shared frame until
+the caller modifies it, and modifications never reach the shared frame or other
+sessions.
+
+Tables can also come from another source, e.g. the live KG (see live.py), by
+setting `backend`. The files are then only read for the tables the backend
+cannot provide.
+
+A snapshot published with a manifest (see hot_reload.py) is served by setting
+`current`. Its tables are versioned by the content hashes of the manifest
+instead of the file signatures, so caches of the tables that did not change stay
+valid when a new snapshot is swapped in. A script run calls `pin()` to read all
+its tables from the same snapshot, even if a new one is swapped in meanwhile.
+"""
+import hashlib
+import os
+import threading
+
+import pandas as pd
+import streamlit as st
+from pyarrow import feather
+
+import profiler
+
+pd.set_option("mode.copy_on_write", True)
+
+# Directory of the snapshot, e.g. a synthetic snapshot created by synthetic_data.py
+DATA_DIR = os.environ.get("KG_DATA_DIR", "data")
+
+# Snapshot being served: (directory, table name -> content hash of its file), or
+# None to serve DATA_DIR. It is only ever replaced as a whole, so a swap is atomic.
+current = None
+_pinned = threading.local()
+
+# Optional source that takes precedence over the files: a function mapping a
+# table name to a (frame, version) pair, or None to read the table from its file
+backend = None
+
+# Table name -> (file name, pd.read_csv keyword arguments)
+TABLES = {
+    "location": ("location.csv", {}),
+    "organization": ("organization.csv", {}),
+    "wp": ("wp.csv", {}),
+    "nodes": ("nodes.csv", {}),
+    "edges": ("edges.csv", {}),
+    "node_stats": ("node_stats.csv", {}),
+    "skillgroups": ("skillgroups.csv", {}),
+    "skills": ("skills.csv", {}),
+    "skills_metadata": ("skills_metadata.csv", {}),
+    "skills_info": ("skills_info.csv", {}),
+    "assays": ("assays.csv", {}),
+    "software": ("software.csv", {}),
+    "target_class": ("target_class.csv", {}),
+    "partner_info": ("partner_info.csv", {}),
+    "person_info": ("person_info.csv", {}),
+    "partner_data": ("partner_data.csv", {}),
+    "software_data": ("software_data.csv", {}),
+    "assay_data": ("assay_data.csv", {}),
+    "target_data": ("target_data.csv", {}),
+    "so_categories": ("so_categories.csv", {}),
+    "standard_operations": ("standard_operations.csv", {}),
+    "clinical_expertise": ("clinical_expertise.tsv", {"sep": "\t", "index_col": 0}),
+    "clinical_expertise_info": ("clinical_expertise_info.tsv", {"sep": "\t"}),
+}
+
+
+def pin(state=None):
+    """Read the tables of the calling thread from a snapshot until the next pin.
+
+    Pins the current snapshot by default.
+    """
+    _pinned.state = state or current
+
+
+def _state() -> tuple:
+    return getattr(_pinned, "state", None) or current or (DATA_DIR, {})
+
+
+def data_dir() -> str:
+    """Get the directory of the snapshot served to the calling thread."""
+    return _state()[0]
+
+
+def table_path(name: str) -> str:
+    """Get the path of the file backing a snapshot table."""
+    file_name, _ = TABLES[name]
+    return os.path.join(data_dir(), file_name)
+
+
+def columnar_path(name: str) -> str:
+    """Get the path of the Arrow IPC copy of a snapshot table."""
+    return os.path.join(data_dir(), f"{name}.arrow")
+
+
+def source_path(name: str) -> str:
+    """Get the file a table is loaded from: the Arrow copy if it is up to date."""
+    path, arrow_path = table_path(name), columnar_path(name)
+    if not os.path.exists(arrow_path):
+        return path
+    if os.path.exists(path) and os.path.getmtime(path) > os.path.getmtime(arrow_path):
+        return path
+    return arrow_path
+
+
+def write_columnar(name: str) -> str:
+    """Convert a CSV table to an uncompressed (memory-mappable) Arrow IPC file.
+
+    The CSV file is parsed with the same options as the dashboard uses, so both
+    formats give identical frames.
+    """
+    _, read_kwargs = TABLES[name]
+    df = pd.read_csv(table_path(name), **read_kwargs)
+
+    arrow_path = columnar_path(name)
+    tmp_path = f"{arrow_path}.tmp"
+    feather.write_feather(df, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, arrow_path)
+    return arrow_path
+
+
+def file_signature(path: str) -> tuple:
+    """Cheap change marker for a file: modification time and size."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+@st.cache_resource(show_spinner=False, max_entries=2 * len(TABLES))
+def _read_table(name: str, signature: tuple, _path: str) -> pd.DataFrame:
+    """Read a table. The cache key is the signature, not the path."""
+    if _path.endswith(".arrow"):
+        return feather.read_table(_path, memory_map=True).to_pandas()
+
+    _, read_kwargs = TABLES[name]
+    return pd.read_csv(_path, **read_kwargs)
+
+
+def _source(name: str) -> tuple:
+    # (path, signature) of the file a table is read from
+    path = source_path(name)
+    content_hash = _state()[1].get(name)
+    if content_hash is not None:
+        return path, ("sha256", content_hash)
+    return path, (path, file_signature(path))
+
+
+def table_signature(name: str) -> tuple:
+    """Version of a table, for use in cache keys of data derived from it."""
+    table = backend(name) if backend is not None else None
+    if table is not None:
+        return "backend", table[1]
+    return _source(name)[1]
+
+
+@st.cache_resource(show_spinner=False, max_entries=2 * len(TABLES))
+def _file_hash(path: str, signature: tuple) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def table_hash(name: str) -> str:
+    """Content hash of the CSV file of a table.
+
+    Unlike the signature, the hash does not change when the snapshot is copied
+    (e.g. into a Docker image), so it can be used as key for on-disk caches.
+    Tables of the backend are identified by their version instead.
+    """
+    table = backend(name) if backend is not None else None
+    if table is not None:
+        return table[1]
+    content_hash = _state()[1].get(name)
+    if content_hash is not None:
+        return content_hash
+    path = table_path(name)
+    return _file_hash(path, file_signature(path))
+
+
+def load_table(name: str) -> pd.DataFrame:
+    """Get a snapshot table by name, reading it only if the file changed."""
+    with profiler.timer("load"):
+        table = backend(name) if backend is not None else None
+        if table is not None:
+            return table[0].copy(deep=False)
+        path, signature = _source(name)
+        return _read_table(name, signature, path).copy(deep=False)
+
+
+def get_location() -> pd.DataFrame:
+    """Partner counts per country (ISO2 code)."""
+    return load_table("location")
+
+
+def get_organization() -> pd.DataFrame:
+    """Number of individuals per partner organisation."""
+    return load_table("organization")
+
+
+def get_wp() -> pd.DataFrame:
+    """Work packages with their lead, individuals and organisations."""
+    return load_table("wp")
+
+
+def get_node_count() -> int:
+    """Total number of nodes in the KG."""
+    return int(load_table("nodes").values[0][0])
+
+
+def get_edge_count() -> int:
+    """Total number of edges in the KG."""
+    return int(load_table("edges").values[0][0])
+
+
+def get_node_stats() -> pd.DataFrame:
+    """Node counts per label."""
+    return load_table("node_stats")
+
+
+def get_skill_groups() -> pd.DataFrame:
+    """All skill groups."""
+    return load_table("skillgroups")
+
+
+def get_skills() -> pd.DataFrame:
+    """Number of individuals per skill."""
+    return load_table("skills")
+
+
+def get_skills_metadata() -> pd.DataFrame:
+    """Skill descriptions grouped by skill group."""
+    return load_table("skills_metadata")
+
+
+def get_skills_info() -> pd.DataFrame:
+    """One row per skill group, skill and individual."""
+    return load_table("skills_info")
+
+
+def get_assays() -> pd.DataFrame:
+    """All assays with their curie and definition."""
+    return load_table("assays")
+
+
+def get_assay_data() -> pd.DataFrame:
+    """One row per assay, individual and partner."""
+    return load_table("assay_data")
+
+
+def get_software() -> pd.DataFrame:
+    """All software/tools with their curie."""
+    return load_table("software")
+
+
+def get_software_data() -> pd.DataFrame:
+    """One row per software, individual and partner."""
+    return load_table("software_data")
+
+
+def get_target_classes() -> pd.DataFrame:
+    """All target classes with their curie."""
+    return load_table("target_class")
+
+
+def get_target_data() -> pd.DataFrame:
+    """One row per target class, individual and partner."""
+    return load_table("target_data")
+
+
+def get_partner_info() -> pd.DataFrame:
+    """Partner names, locations, acronyms and links."""
+    return load_table("partner_info")
+
+
+def get_person_info() -> pd.DataFrame:
+    """Individuals with their affiliation and ORCID."""
+    return load_table("person_info")
+
+
+def get_partner_data() -> pd.DataFrame:
+    """Non-person entities connected to each partner."""
+    return load_table("partner_data")
+
+
+def get_so_categories() -> pd.DataFrame:
+    """Standard operating categories with their description."""
+    return load_table("so_categories")
+
+
+def get_standard_operations() -> pd.DataFrame:
+    """Standard operating protocols and guidelines."""
+    return load_table("standard_operations")
+
+
+def get_clinical_expertise() -> pd.DataFrame:
+    """Clinical skill (index) × partner availability matrix."""
+    return load_table("clinical_expertise")
+
+
+def get_clinical_expertise_info() -> pd.DataFrame:
+    """Clinical skill definitions and sources."""
+    return load_table("clinical_expertise_info")
+
+
+if __name__ == "__main__":
+    # Write the Arrow copy of every table in the snapshot
+    for table_name in TABLES:
+        if os.path.exists(table_path(table_name)):
+            print(f"Saved {write_columnar(table_name)}")
@@ -1,3 +1,3 @@
 #!/bin/bash
 
-streamlit run dashboard.py --server.port=8501 --server.address=0.0.0.0
\ No newline at end of file
+python serve.py --server.port=8501 --server.address=0.0.0.0
\ No newline at end of file
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""Import-time budget of the dashboard.
+
+The modules imported by dashboard.py are imported in a fresh interpreter with
+`python -X importtime`, and the cumulative import time of each top-level
+package is summarized. The check fails when the total exceeds the budget
+(`--budget` or KG_IMPORT_BUDGET, in seconds) or when one of the deferred
+packages, which the dashboard only imports in the panels that need them, is
+imported at startup:
+
+    python startup_benchmark.py --budget 1.5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import Counter
+
+# Modules imported by dashboard.py when a session starts
+RUNTIME_MODULES = [
+    "streamlit",
+    "aggregations",
+    "artifacts",
+    "figures",
+    "hot_reload",
+    "live",
+    "profiler",
+    "search",
+    "snapshot",
+    "wordclouds",
+]
+
+# Packages that must only be imported on first use
+DEFERRED_MODULES = [
+    "plotly.express",
+    "wordcloud",
+    "matplotlib",
+    "py2neo",
+    "watchdog",
+]
+
+DEFAULT_BUDGET = float(os.environ.get("KG_IMPORT_BUDGET", "1.5"))
+
+
+def parse_importtime(output: str) -> list:
+    """Get the (module, depth, self seconds, cumulative seconds) of an importtime log."""
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        imports.append(
+            (name.strip(), depth, int(self_us) / 1e6, int(cumulative_us) / 1e6)
+        )
+    return imports
+
+
+def measure(modules: list) -> list:
+    """Import the modules in a new interpreter and get its importtime log."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def summarize(imports: list, modules: list) -> tuple:
+    """Get the total import time of the modules and the self time per package.
+
+    Imports done by the interpreter itself (e.g. site) are left out.
+    """
+    total, packages, pending = 0.0, Counter(), Counter()
+    # Nested imports are logged before the module importing them
+    for name, depth, self_time, cumulative in imports:
+        pending[name.split(".")[0]] += self_time
+        if depth == 0:
+            if name in modules:
+                total += cumulative
+                packages.update(pending)
+            pending = Counter()
+    return total, packages
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the import time budget")
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=DEFAULT_BUDGET,
+        help="Maximum import time in seconds",
+    )
+    parser.add_argument(
+        "--runs", type=int, default=3, help="Number of runs (the median is checked)"
+    )
+    parser.add_argument(
+        "--top", type=int, default=10, help="Number of packages in the summary"
+    )
+    args = parser.parse_args()
+
+    runs = [measure(RUNTIME_MODULES) for _ in range(args.runs)]
+    totals = [summarize(imports, RUNTIME_MODULES)[0] for imports in runs]
+    total = statistics.median(totals)
+    # Summarize the run closest to the median
+    imports = min(runs, key=lambda i: abs(summarize(i, RUNTIME_MODULES)[0] - total))
+    _, packages = summarize(imports, RUNTIME_MODULES)
+
+    print(f"Import time of {', '.join(RUNTIME_MODULES)}")
+    for package, seconds in packages.most_common(args.top):
+        print(f"  {package:<30} {seconds:8.3f}s")
+    print(f"  {'total':<30} {total:8.3f}s (budget {args.budget:.3f}s)")
+
+    imported = {name for name, _, _, _ in imports}
+    eager = [module for module in DEFERRED_MODULES if module in imported]
+    for module in eager:
+        print(f"Deferred module imported at startup: {module}")
+    if total > args.budget:
+        print(f"Import time exceeds the budget by {total - args.budget:.3f}s")
+    sys.exit(1 if eager or total > args.budget else 0)
@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+"""Synthetic KG snapshots for testing the dashboard at scale.
+
+The generated files have the same names and columns as the files written by
+queries.py, so the dashboard can be pointed at them with the KG_DATA_DIR
+environment variable. The number of partners, individuals and capabilities is
+multiplied by the scale factor, while the number of links per individual stays
+the same as in the real KG, so the tables grow linearly with the scale.
+
+    python synthetic_data.py --scale 100 --output synthetic/x100
+    KG_DATA_DIR=synthetic/x100 streamlit run dashboard.py
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+import geo
+import snapshot
+
+# Size of the real KG at scale 1
+BASE_COUNTS = {
+    "partners": 24,
+    "persons": 87,
+    "skills": 46,
+    "assays": 240,
+    "software": 129,
+    "target_classes": 41,
+    "sops": 12,
+    "clinical_services": 27,
+}
+
+# Average number of capabilities linked to each individual in the real KG
+LINKS_PER_PERSON = {
+    "skills": 6,
+    "assays": 60,
+    "software": 30,
+    "target_classes": 7,
+}
+
+# Entities that do not grow with the size of the consortium
+SKILL_GROUPS = [
+    "Drug Development Group",
+    "Communication and Project Management Group",
+    "Drug Discovery Group",
+]
+SO_CATEGORIES = [
+    "Pre-clinical experimental workflows",
+    "Computational analysis",
+    "Data management and quality",
+    "Pre-clinical research reporting",
+]
+SO_TYPES = ["SOP", "SOG", "SOP, SOG"]
+WORK_PACKAGES = 12
+KEYWORDS = 60
+
+
+def _orcid(i: int) -> str:
+    digits = f"{i:016d}"
+    return "https://orcid.org/" + "-".join(digits[j : j + 4] for j in range(0, 16, 4))
+
+
+def _pick(rng, items, counts):
+    """Pick `counts[i]` distinct items for each i."""
+    return [
+        list(rng.choice(items, size=min(n, len(items)), replace=False)) for n in counts
+    ]
+
+
+def generate(scale: float = 1, seed: int = 0) -> dict:
+    """Generate all snapshot tables (table name -> data frame) at a scale factor."""
+    rng = np.random.default_rng(seed)
+    n = {key: max(1, round(count * scale)) for key, count in BASE_COUNTS.items()}
+
+    countries = sorted(
+        feature["properties"]["ISO2"]
+        for feature in geo._read_geojson(geo.GEOJSON_PATH)["features"]
+    )
+    partners = pd.DataFrame(
+        {
+            "Name": [f"Partner organisation {i}" for i in range(n["partners"])],
+            "Location": rng.choice(countries, size=n["partners"]),
+            "acronym": [f"P{i}" for i in range(n["partners"])],
+            "info_link": [
+                f"https://partner{i}.example.org/" for i in range(n["partners"])
+            ],
+        }
+    )
+    persons = pd.DataFrame(
+        {
+            "Partner": rng.choice(partners["Name"], size=n["persons"]),
+            "Name": [f"Person{i} Surname{i}" for i in range(n["persons"])],
+            "ORCID": [_orcid(i) for i in range(n["persons"])],
+        }
+    )
+    affiliation = dict(zip(persons["Name"], persons["Partner"]))
+
+    skills = pd.DataFrame(
+        {
+            "SkillGroup": rng.choice(SKILL_GROUPS, size=n["skills"]),
+            "Skill": [f"Skill {i}" for i in range(n["skills"])],
+            "Curie": [f"SKILLS:{i:05d}" for i in range(n["skills"])],
+            "description": [f"Description of skill {i}." for i in range(n["skills"])],
+            "url": [f"https://skills.example.org/{i}" for i in range(n["skills"])],
+        }
+    )
+    capabilities = {
+        "assays": pd.DataFrame(
+            {
+                "Assay": [f"Assay {i}" for i in range(n["assays"])],
+                "Curie": [f"BAO:{i:07d}" for i in range(n["assays"])],
+                "Definition": [f"Definition of assay {i}." for i in range(n["assays"])],
+            }
+        ),
+        "software": pd.DataFrame(
+            {
+                "Software": [f"Software {i}" for i in range(n["software"])],
+                "Curie": [f"BAO:{i + 5000000:07d}" for i in range(n["software"])],
+            }
+        ),
+        "target_classes": pd.DataFrame(
+            {
+                "Target": [f"Target class {i}" for i in range(n["target_classes"])],
+                "Curie": [f"EC:{i}" for i in range(n["target_classes"])],
+            }
+        ),
+    }
+
+    def links(key: str, names) -> pd.DataFrame:
+        # Poisson number of capabilities per individual, like a long tail
+        counts = rng.poisson(LINKS_PER_PERSON[key], size=n["persons"])
+        picked = _pick(rng, np.asarray(names), counts)
+        df = pd.DataFrame({"info": persons["Name"], "Name": picked}).explode("Name")
+        df = df.dropna(subset=["Name"])
+        df["Partner"] = df["info"].map(affiliation)
+        return df[["Name", "info", "Partner"]].reset_index(drop=True)
+
+    skill_links = links("skills", skills["Skill"])
+    skill_group = dict(zip(skills["Skill"], skills["SkillGroup"]))
+    skills_info = pd.DataFrame(
+        {
+            "Group": skill_links["Name"].map(skill_group),
+            "Skill": skill_links["Name"],
+            "Individual": skill_links["info"],
+            "ORCID": skill_links["info"].map(
+                dict(zip(persons["Name"], persons["ORCID"]))
+            ),
+            "Affiliation": skill_links["Partner"],
+        }
+    )
+
+    # Like the KG query, one row per skill and each node (group or individual) linked to it
+    individuals = skills_info.groupby("Skill")["Individual"].nunique()
+    skill_rows = pd.concat(
+        [
+            skills[["SkillGroup", "Skill"]].set_axis(["name", "skill_name"], axis=1),
+            skills_info[["Individual", "Skill"]].set_axis(
+                ["name", "skill_name"], axis=1
+            ),
+        ]
+    )
+    skill_rows = skill_rows[skill_rows["skill_name"].isin(individuals.index)]
+    skill_rows["Individuals"] = skill_rows["skill_name"].map(individuals)
+
+    assay_data = links("assays", capabilities["assays"]["Assay"])
+    software_data = links("software", capabilities["software"]["Software"])
+    target_data = links("target_classes", capabilities["target_classes"]["Target"])
+    partner_data = (
+        pd.concat([assay_data, software_data, target_data])[["Name", "Partner"]]
+        .drop_duplicates()
+        .reset_index(drop=True)
+    )
+
+    keywords = [f"keyword {i}" for i in range(KEYWORDS)]
+    sops = pd.DataFrame(
+        {
+            "ID": [f"R4A_SO:{i + 1}" for i in range(n["sops"])],
+            "Category": rng.choice(SO_CATEGORIES, size=n["sops"]),
+            "Type": rng.choice(SO_TYPES, size=n["sops"]),
+            "Title": [f"Standard operation {i}" for i in range(n["sops"])],
+            "DOI": [f"https://doi.org/10.5281/zenodo.{i}" for i in range(n["sops"])],
+            "Keywords": [", ".join(k) for k in _pick(rng, keywords, [4] * n["sops"])],
+            "Creator": [
+                ", ".join(p) for p in _pick(rng, persons["Name"], [1] * n["sops"])
+            ],
+            "Reviewer": [
+                ", ".join(p) for p in _pick(rng, persons["Name"], [2] * n["sops"])
+            ],
+        }
+    )
+    so_categories = pd.DataFrame(
+        {
+            "ID": [f"R4A_SOC:{i + 1}" for i in range(len(SO_CATEGORIES))],
+            "Category": SO_CATEGORIES,
+            "Description": [f"Description of {c.lower()}." for c in SO_CATEGORIES],
+        }
+    )
+
+    services = [f"Clinical service {i}" for i in range(n["clinical_services"])]
+    available = rng.random((len(services), n["partners"])) < 0.3
+    clinical_expertise = pd.DataFrame(
+        np.where(available, "Available", None),
+        index=pd.Index(services, name="Skill name"),
+        columns=partners["Name"],
+    )
+    clinical_expertise_info = pd.DataFrame(
+        {
+            "Services": services,
+            "Definition": [f"Definition of {s.lower()}." for s in services],
+            "Source": "Synthetic",
+            "Source link": None,
+        }
+    )
+
+    wp_members = rng.integers(0, WORK_PACKAGES, size=n["persons"])
+    wp = pd.DataFrame(
+        {
+            "WP": [f"Work package {i + 1}" for i in range(WORK_PACKAGES)],
+            "lead": rng.choice(partners["Name"], size=WORK_PACKAGES),
+            "id": [f"WP{i + 1}" for i in range(WORK_PACKAGES)],
+            "Individuals": np.bincount(wp_members, minlength=WORK_PACKAGES),
+            "Organizations": [
+                persons.loc[wp_members == i, "Partner"].nunique()
+                for i in range(WORK_PACKAGES)
+            ],
+        }
+    )
+
+    node_stats = pd.DataFrame(
+        {
+            "Nodes": [
+                "Person",
+                "Partner",
+                "Skill",
+                "Experiment",
+                "Software",
+                "TargetClass",
+                "StandardOperationCategory",
+                "StandardOperation",
+                "WorkPackage",
+            ],
+            "Counts": [
+                n["persons"],
+                n["partners"],
+                n["skills"],
+                n["assays"],
+                n["software"],
+                n["target_classes"],
+                len(SO_CATEGORIES),
+                n["sops"],
+                WORK_PACKAGES,
+            ],
+        }
+    )
+    edge_stats = pd.DataFrame(
+        {
+            "Edges": ["AFFILIATED_WITH", "HAS_SKILL", "WORKS_ON", "PART_OF"],
+            "Counts": [
+                n["persons"],
+                len(skill_links),
+                len(assay_data) + len(software_data) + len(target_data),
+                n["persons"] + n["skills"],
+            ],
+        }
+    )
+
+    return {
+        "location": partners.groupby("Location", sort=False)
+        .size()
+        .reset_index(name="Partner counts"),
+        "organization": persons.groupby("Partner")
+        .size()
+        .reset_index(name="Individuals"),
+        "wp": wp,
+        "nodes": pd.DataFrame({"COUNT(n)": [node_stats["Counts"].sum()]}),
+        "edges": pd.DataFrame({"COUNT(distinct r)": [edge_stats["Counts"].sum()]}),
+        "node_stats": node_stats,
+        "skillgroups": pd.DataFrame({"SkillGroup": SKILL_GROUPS}),
+        "skills": skill_rows.reset_index(drop=True),
+        "skills_metadata": skills,
+        "skills_info": skills_info,
+        "assays": capabilities["assays"],
+        "software": capabilities["software"],
+        "target_class": capabilities["target_classes"],
+        "partner_info": partners,
+        "person_info": persons,
+        "partner_data": partner_data,
+        "software_data": software_data,
+        "assay_data": assay_data,
+        "target_data": target_data,
+        "so_categories": so_categories,
+        "standard_operations": sops,
+        "clinical_expertise": clinical_expertise,
+        "clinical_expertise_info": clinical_expertise_info,
+    }
+
+
+def write_snapshot(tables: dict, output: str, columnar: bool = True) -> dict:
+    """Write generated tables like the export does and return their row counts."""
+    os.makedirs(output, exist_ok=True)
+    data_dir, snapshot.DATA_DIR = snapshot.DATA_DIR, output
+    try:
+        for name, df in tables.items():
+            file_name, read_kwargs = snapshot.TABLES[name]
+            df.to_csv(
+                snapshot.table_path(name),
+                sep=read_kwargs.get("sep", ","),
+                index="index_col" in read_kwargs,
+            )
+            if columnar:
+                snapshot.write_columnar(name)
+    finally:
+        snapshot.DATA_DIR = data_dir
+    return {name: len(df) for name, df in tables.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic KG snapshot")
+    parser.add_argument(
+        "--scale", type=float, default=10, help="Size relative to the real KG"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Seed of the random generator"
+    )
+    parser.add_argument(
+        "--output", default=None, help="Output directory (default: synthetic/x<scale>)"
+    )
+    parser.add_argument(
+        "--csv-only", action="store_true", help="Do not write the Arrow copies"
+    )
+    args = parser.parse_args()
+
+    output = args.output or os.path.join("synthetic", f"x{args.scale:g}")
+    rows = write_snapshot(
+        generate(args.scale, args.seed), output, columnar=not args.csv_only
+    )
+    print(json.dumps(rows, indent=2))
+    print(f"Synthetic snapshot written to {output}")
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""In-process fakes of the KG for the tests."""
+import time
+
+import pandas as pd
+
+import kg_stats
+import snapshot
+
+STATS = {
+    "nodeCount": 10,
+    "relCount": 5,
+    "labels": {"Person": 8, "Partner": 2},
+}
+
+
+class Cursor:
+    def __init__(self, records):
+        self.records = records
+
+    def to_data_frame(self):
+        return pd.DataFrame(self.records)
+
+    def data(self):
+        return self.records
+
+
+class FakeGraph:
+    """Answers queries with fixed results, and the table queries with the snapshot.
+
+    `tables` maps the query of a table to the table name (see
+    live._table_queries), `results` maps other queries to their records.
+    """
+
+    def __init__(self, tables=None, results=None):
+        self.tables = tables or {}
+        self.results = {kg_stats.STATS_QUERY: [STATS], **(results or {})}
+        self.calls = []
+        self.parameters = []
+        self.delay = 0.0
+        self.down = False
+
+    def run(self, query, parameters=None):
+        if self.down:
+            raise ConnectionError("KG unreachable")
+        self.calls.append(query)
+        self.parameters.append(parameters)
+        time.sleep(self.delay)
+        if query in self.tables:
+            return Cursor(pd.read_csv(snapshot.table_path(self.tables[query])))
+        return Cursor(self.results[query])
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+
+class FakeResult:
+    """Result of a query on a FakeConnector, holding the pulled records."""
+
+    def __init__(self, fields, rows):
+        self._fields = fields
+        self.pending = list(rows)
+        self.pulled = []
+
+    def fields(self):
+        return self._fields
+
+    def take(self):
+        return self.pulled.pop(0) if self.pulled else None
+
+    def has_more_records(self):
+        return bool(self.pending)
+
+
+class FakeConnector:
+    """Bolt connector answering every query with the same records.
+
+    Only the records pulled with `pull` are buffered; `most_buffered` is the
+    largest number of records held at once.
+    """
+
+    def __init__(self, fields, rows):
+        from py2neo import ConnectionProfile
+
+        self.profile = ConnectionProfile("bolt://localhost:7687")
+        self.fields, self.rows = fields, rows
+        self.runs = []
+        self.pulls = []
+        self.most_buffered = 0
+
+    def run(self, tx, cypher, parameters=None):
+        self.runs.append((tx, cypher, parameters))
+        return FakeResult(self.fields, self.rows)
+
+    def pull(self, result, n=-1):
+        self.pulls.append(n)
+        n = len(result.pending) if n == -1 else n
+        result.pulled += result.pending[:n]
+        del result.pending[:n]
+        self.most_buffered = max(self.most_buffered, len(result.pulled))
+
+
+class FakeTransaction:
+    def __init__(self, graph):
+        self.graph = graph
+        self._connector = graph.connector
+        self.ref = f"tx{len(graph.transactions)}"
+
+
+class FakeBoltGraph:
+    """Graph opening transactions on a FakeConnector."""
+
+    def __init__(self, connector):
+        self.connector = connector
+        self.transactions = []
+        self.committed = []
+        self.rolled_back = []
+
+    def begin(self, readonly=False):
+        tx = FakeTransaction(self)
+        self.transactions.append((tx, readonly))
+        return tx
+
+    def commit(self, tx):
+        self.committed.append(tx)
+
+    def rollback(self, tx):
+        self.rolled_back.append(tx)
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Aggregations of aggregations.py compared with the former loops."""
+import pandas as pd
+import pytest
+
+import aggregations
+import artifacts
+import snapshot
+
+SOPS = pd.DataFrame(
+    {
+        "ID": ["SO:1", "SO:2", "SO:2", "SO:3"],
+        "Category": ["Data", "Data", "Workflows", "Data"],
+        "Creator": ["Ann Lee", "Bo Kim, Ann Lee", "Bo Kim", None],
+        "Reviewer": ["Ann Lee, Cy Ng", "Cy Ng", "Bo Kim", "Cy Ng,  "],
+    }
+)
+CATEGORIES = pd.DataFrame({"Category": ["Workflows", "Data"]})
+
+
+@pytest.fixture
+def sops(monkeypatch):
+    monkeypatch.setattr(snapshot, "get_standard_operations", SOPS.copy)
+    monkeypatch.setattr(snapshot, "get_so_categories", CATEGORIES.copy)
+    monkeypatch.setattr(snapshot, "table_signature", lambda name: ("test", name))
+    monkeypatch.setattr(artifacts, "lookup", lambda key, tables: None)
+    aggregations._sop_participants.clear()
+    aggregations._sop_expertise_matrix.clear()
+    yield
+    aggregations._sop_participants.clear()
+    aggregations._sop_expertise_matrix.clear()
+
+
+def expertise_loop(so_data: pd.DataFrame) -> pd.DataFrame:
+    # Matrix of the dashboard before the aggregation (counts once per row)
+    names = set()
+    for column in ["Creator", "Reviewer"]:
+        for value in so_data[column].dropna():
+            names.update(n.strip() for n in value.split(",") if n.strip())
+    matrix = pd.DataFrame(0, index=sorted(names), columns=CATEGORIES["Category"])
+    for _, row in so_data.iterrows():
+        participants = set()
+        for column in ["Creator", "Reviewer"]:
+            value = row[column] if pd.notna(row[column]) else ""
+            participants.update(n.strip() for n in value.split(",") if n.strip())
+        for participant in participants:
+            matrix.loc[participant, row["Category"]] += 1
+    return matrix
+
+
+def test_participants(sops):
+    participants = aggregations.get_sop_participants()
+    assert list(participants.columns) == ["Row", "ID", "Category", "Role", "Name"]
+    assert len(participants) == 9
+    assert "" not in set(participants["Name"])
+    assert aggregations.get_sop_participant_names("Creator") == ["Ann Lee", "Bo Kim"]
+
+
+def test_expertise_matrix_matches_loop(sops):
+    matrix = aggregations.get_sop_expertise_matrix()
+    expected = expertise_loop(SOPS).reindex(matrix.index)
+    pd.testing.assert_frame_equal(matrix, expected, check_names=False)
+
+
+def test_repeated_id_counts_per_row(sops):
+    matrix = aggregations.get_sop_expertise_matrix()
+    # SO:2 is in two categories, Bo Kim worked on both rows
+    assert matrix.loc["Bo Kim", "Data"] == 1
+    assert matrix.loc["Bo Kim", "Workflows"] == 1
+    # Creator and reviewer of SO:1 at once
+    assert matrix.loc["Ann Lee", "Data"] == 2
+    assert list(matrix.index) == ["Bo Kim", "Ann Lee", "Cy Ng"]
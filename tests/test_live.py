@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""Live mode against an in-process fake of the KG."""
+import threading
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("py2neo")
+
+import kg_stats  # noqa: E402
+import live  # noqa: E402
+import snapshot  # noqa: E402
+from fakes import Clock, FakeGraph  # noqa: E402
+
+
+@pytest.fixture
+def kg(monkeypatch):
+    graph = FakeGraph(
+        tables={query: table for table, query in live._table_queries().items()}
+    )
+    clock = Clock()
+    monkeypatch.setattr(live, "LIVE_URL", "bolt://fake:7687")
+    monkeypatch.setattr(live, "_graph", lambda url, username: graph)
+    monkeypatch.setattr(live, "time", clock)
+    monkeypatch.setattr(live, "_unavailable_until", 0.0)
+    monkeypatch.setattr(live, "_last_tables", {})
+    monkeypatch.setattr(snapshot, "backend", None)
+    live._fetch.clear()
+    live.install()
+    yield graph, clock
+    live._fetch.clear()
+
+
+def read_snapshot(table: str) -> pd.DataFrame:
+    _, read_kwargs = snapshot.TABLES[table]
+    return pd.read_csv(snapshot.table_path(table), **read_kwargs)
+
+
+def read_source(table: str) -> pd.DataFrame:
+    # The file the snapshot serves the table from (possibly its Arrow copy)
+    path, signature = snapshot._source(table)
+    return snapshot._read_table(table, signature, path)
+
+
+def test_tables_match_snapshot(kg):
+    assert snapshot.backend is live.get_table
+    for table in ["location", "skills_info", "standard_operations", "assay_data"]:
+        pd.testing.assert_frame_equal(snapshot.load_table(table), read_snapshot(table))
+    assert snapshot.table_signature("location")[0] == "backend"
+
+
+def test_tables_not_in_kg_come_from_snapshot(kg):
+    graph, _ = kg
+    assert live.get_table("clinical_expertise") is None
+    pd.testing.assert_frame_equal(
+        snapshot.load_table("clinical_expertise"), read_source("clinical_expertise")
+    )
+    assert graph.calls == []
+
+
+def test_stats_tables(kg):
+    assert snapshot.get_node_count() == 10
+    assert snapshot.get_edge_count() == 5
+    assert list(snapshot.get_node_stats()["Nodes"]) == ["Person", "Partner"]
+
+
+def test_results_expire_after_ttl(kg):
+    graph, clock = kg
+    live.get_table("wp")
+    live.get_table("wp")
+    assert len(graph.calls) == 1
+
+    clock.now += live.DEFAULT_TTL / 2
+    live.get_table("wp")
+    assert len(graph.calls) == 1
+
+    clock.now += live.DEFAULT_TTL
+    live.get_table("wp")
+    assert len(graph.calls) == 2
+
+
+def test_stats_have_own_ttl(kg):
+    graph, clock = kg
+    live.get_table("nodes")
+    live.get_table("edges")
+    assert graph.calls == [kg_stats.STATS_QUERY]
+
+    clock.now += live.TTL["kg_stats"]
+    live.get_table("node_stats")
+    assert graph.calls == [kg_stats.STATS_QUERY] * 2
+
+
+def test_concurrent_requests_send_one_query(kg):
+    graph, _ = kg
+    graph.delay = 0.2
+    threads = [
+        threading.Thread(target=snapshot.load_table, args=("wp",)) for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(graph.calls) == 1
+
+
+def test_fallback_to_last_result(kg):
+    graph, clock = kg
+    fetched = live.get_table("wp")
+
+    graph.down = True
+    clock.now += live.DEFAULT_TTL
+    assert live.get_table("wp") is fetched
+    # The KG is not contacted again until the retry delay has passed
+    graph.down = False
+    clock.now += live.RETRY_AFTER / 2
+    assert live.get_table("wp") is fetched
+    assert len(graph.calls) == 1
+
+    clock.now += live.RETRY_AFTER
+    live.get_table("wp")
+    assert len(graph.calls) == 2
+
+
+def test_fallback_to_snapshot(kg):
+    graph, _ = kg
+    graph.down = True
+    assert live.get_table("wp") is None
+    pd.testing.assert_frame_equal(snapshot.load_table("wp"), read_source("wp"))
+    assert snapshot.table_signature("wp")[0] != "backend"
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""Export queries of queries.py against an in-process fake of the KG."""
+import inspect
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("py2neo")
+
+import queries  # noqa: E402
+from fakes import (  # noqa: E402
+    FakeBoltGraph,
+    FakeConnector,
+    FakeGraph,
+    FakeTransaction,
+)
+
+TECH_INFO = [
+    {"Name": "O'Reilly assay", "info": "Assay", "Partner": "EMBL", "Percentage": 2}
+]
+
+
+def test_tech_info_passes_name_as_parameter():
+    query, parameters = queries.get_tech_info("O'Reilly assay")
+    assert "O'Reilly" not in query
+    assert parameters == {"name": "O'Reilly assay"}
+
+    graph = FakeGraph(results={query: TECH_INFO})
+    df = queries.run_query(query, parameters, source=graph).to_data_frame()
+    pd.testing.assert_frame_equal(df, pd.DataFrame(TECH_INFO))
+    assert graph.parameters == [{"name": "O'Reilly assay"}]
+
+
+def test_tech_infos_share_one_query():
+    query, parameters = queries.get_tech_infos(iter(["a", "b"]))
+    assert query == queries.get_tech_infos(["c"])[0]
+    assert parameters == {"names": ["a", "b"]}
+
+    graph = FakeGraph(results={query: TECH_INFO})
+    queries.run_query(query, parameters, source=graph)
+    assert graph.calls == [query]
+
+
+def test_run_query_without_parameters():
+    graph = FakeGraph(results={queries.get_labels(): [{"label": "Partner"}]})
+    assert queries.run_query(queries.get_labels(), source=graph).data() == [
+        {"label": "Partner"}
+    ]
+    assert graph.parameters == [{}]
+
+
+def test_tech_data_rejects_unknown_class():
+    with pytest.raises(AssertionError):
+        queries.get_tech_data("Person")
+
+
+@pytest.fixture
+def bolt(monkeypatch):
+    # 10 records pulled 3 at a time
+    monkeypatch.setattr(queries, "BATCH_SIZE", 3)
+    monkeypatch.setattr(queries, "Transaction", FakeTransaction)
+    connector = FakeConnector(["Name", "Count"], [[f"n{i}", i] for i in range(10)])
+    return connector, FakeBoltGraph(connector)
+
+
+def test_pull_batches_streams_the_records(bolt, tmp_path):
+    connector, graph = bolt
+    fields, batches = queries.pull_batches(graph, "MATCH (n) RETURN n", {"a": 1})
+    assert fields == ["Name", "Count"]
+    # Nothing beyond the first batch is pulled before the records are read
+    assert connector.pulls == [3]
+
+    changed, rows, _ = queries.stream_csv(fields, batches, str(tmp_path / "t.csv"))
+    assert (changed, rows) == (True, 10)
+    assert connector.pulls == [3, 3, 3, 3]
+    assert connector.most_buffered == 3
+    assert pd.read_csv(tmp_path / "t.csv")["Count"].tolist() == list(range(10))
+
+    tx, readonly = graph.transactions[0]
+    assert readonly and graph.committed == [tx]
+    assert connector.runs == [(tx.ref, "MATCH (n) RETURN n", {"a": 1})]
+
+
+def test_pull_batches_in_open_transaction(bolt):
+    _, graph = bolt
+    tx = graph.begin()
+    _, batches = queries.pull_batches(tx, "RETURN 1")
+    assert sum(len(batch) for batch in batches) == 10
+    # The transaction of the caller is left open
+    assert graph.transactions == [(tx, False)] and graph.committed == []
+
+
+def test_pull_batches_rolls_back_on_error(bolt):
+    _, graph = bolt
+    _, batches = queries.pull_batches(graph, "RETURN 1")
+    next(batches)
+    with pytest.raises(RuntimeError):
+        batches.throw(RuntimeError("disk full"))
+    assert graph.rolled_back == [graph.transactions[0][0]]
+    assert graph.committed == []
+
+
+def test_py2neo_internals():
+    # pull_batches relies on these private APIs of the pinned py2neo version
+    from py2neo import Transaction
+    from py2neo.client import Connection, Connector
+    from py2neo.client.bolt import BoltResult
+
+    assert "n" in inspect.signature(Connector.pull).parameters
+    assert list(inspect.signature(Connector.run).parameters)[1:3] == ["tx", "cypher"]
+    assert "_connector" in inspect.getsource(Transaction.__init__)
+    assert isinstance(Transaction.ref, property)
+    for method in ("fields", "take", "has_more_records"):
+        assert callable(getattr(BoltResult, method))
+
+    hydrant = Connection.default_hydrant(FakeConnector([], []).profile, None)
+    assert hydrant.hydrate_list(["n1", 1, None]) == ["n1", 1, None]
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Readiness of a server across bakes of the bundle."""
+import json
+import os
+import pickle
+import threading
+import time
+
+import pytest
+
+import artifacts
+import readiness
+
+
+@pytest.fixture
+def bundle_dir(tmp_path, monkeypatch):
+    paths = {
+        "BUNDLE_DIR": str(tmp_path),
+        "MANIFEST_PATH": str(tmp_path / "manifest.json"),
+        "LOADED_PATH": str(tmp_path / "loaded.json"),
+    }
+    for module in (artifacts, readiness):
+        for name, path in paths.items():
+            monkeypatch.setattr(module, name, path)
+    artifacts._load_bundle.clear()
+    yield tmp_path
+    artifacts._load_bundle.clear()
+
+
+def fake_bake(monkeypatch, version: str):
+    # Bake an empty bundle of a snapshot with the given version
+    monkeypatch.setattr(artifacts, "snapshot_version", lambda: version)
+    manifest = {"version": version, "bundle": f"bundle-{version}.pkl", "entries": 0}
+    with open(os.path.join(readiness.BUNDLE_DIR, manifest["bundle"]), "wb") as f:
+        pickle.dump({}, f)
+    with open(f"{readiness.MANIFEST_PATH}.tmp", "w") as f:
+        json.dump(manifest, f)
+    os.replace(f"{readiness.MANIFEST_PATH}.tmp", readiness.MANIFEST_PATH)
+
+
+def wait_until_ready(timeout: float = 5.0) -> list:
+    deadline = time.monotonic() + timeout
+    while (problems := readiness.check()) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return problems
+
+
+def test_not_ready_without_bundle(bundle_dir):
+    assert readiness.check() == [f"No bundle in {bundle_dir}"]
+
+
+def test_not_ready_until_loaded(bundle_dir, monkeypatch):
+    fake_bake(monkeypatch, "a")
+    assert readiness.check() == ["The dashboard has not loaded the bundle"]
+    artifacts.load_bundle()
+    assert readiness.check() == []
+
+
+def test_outdated_bundle(bundle_dir, monkeypatch):
+    fake_bake(monkeypatch, "a")
+    artifacts.load_bundle()
+    monkeypatch.setattr(artifacts, "snapshot_version", lambda: "b")
+    artifacts._load_bundle.clear()
+    artifacts.load_bundle()
+    assert readiness.check() == ["Bundle a is outdated"]
+
+
+def test_server_loads_rebaked_bundle(bundle_dir, monkeypatch):
+    fake_bake(monkeypatch, "a")
+    artifacts.load_bundle()
+    fake_bake(monkeypatch, "bb")
+    # Without sessions nothing looks up the new bundle
+    assert readiness.check() == ["The dashboard has not loaded bundle bb"]
+
+    stop = threading.Event()
+    loader = threading.Thread(target=artifacts.keep_loaded, args=(0.01, stop))
+    loader.start()
+    try:
+        assert wait_until_ready() == []
+        with open(readiness.LOADED_PATH) as f:
+            assert json.load(f)["version"] == "bb"
+    finally:
+        stop.set()
+        loader.join()
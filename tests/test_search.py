@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Search index of search.py compared with substring matching."""
+import pandas as pd
+import pytest
+
+import search
+
+SOPS = pd.DataFrame(
+    {
+        "ID": ["R4A_SO:1", "R4A_SO:2", "R4A_SO:10", "R4A_SO:11"],
+        "Title": [
+            "Detection of Drug-Induced-Phospholipidosis",
+            "Fair Data Assessment",
+            "Phospholipidosis screening of small molecules",
+            "Drug repurposing in clinical trials",
+        ],
+        "Keywords": [
+            "phospholipidosis, HCS",
+            "fair, data management",
+            "HCS, screening",
+            None,
+        ],
+    }
+)
+
+
+@pytest.fixture
+def index():
+    return search.InvertedIndex(
+        SOPS, {"Title": 3.0, "Keywords": 2.0, "ID": 1.0}, ("Keywords",)
+    )
+
+
+def contains(column: str, text: str) -> set:
+    # Matching of the dashboard before the index
+    return set(SOPS.index[SOPS[column].str.contains(text, case=False, na=False)])
+
+
+@pytest.mark.parametrize("query", ["phospho", "Drug", "assess", "lipidosis", "ening"])
+def test_word_matches_like_substring(index, query):
+    assert set(index.search(query, fields=["Title"])) == contains("Title", query)
+
+
+def test_all_tokens_must_match(index):
+    expected = contains("Title", "drug") & contains("Title", "phospho")
+    assert expected == {0}
+    assert index.search("drug phospho", fields=["Title"]) == [0]
+    assert index.search("phospho clinical", fields=["Title"]) == []
+
+
+def test_exact_matches_rank_first(index):
+    assert index.search("phospholipidosis screening", fields=["Title"]) == [2]
+    assert index.search("data")[0] == 1
+
+
+def test_fields_restrict_the_search(index):
+    assert index.search("hcs", fields=["Title"]) == []
+    assert set(index.search("hcs", fields=["Keywords"])) == contains("Keywords", "hcs")
+    assert set(index.search("hcs")) == {0, 2}
+
+
+def test_id_tokens(index):
+    assert set(index.search("4A", fields=["ID"])) == contains("ID", "4A")
+    assert set(index.search("SO:1", fields=["ID"])) == contains("ID", "SO:1")
+
+
+def test_empty_query_matches_all_rows(index):
+    assert index.search("  ") == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize("tag", ["HCS", "fair", "data management"])
+def test_tags_match_like_substring(index, tag):
+    assert set(index.match_tags("Keywords", [tag])) == contains("Keywords", tag)
+
+
+def test_tags_are_matched_whole_and_all_required(index):
+    assert index.match_tags("Keywords", ["hcs", "Screening"]) == [2]
+    assert index.match_tags("Keywords", ["data"]) == []
+    assert index.match_tags("Keywords", []) == [0, 1, 2, 3]
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Cached word clouds of the expertise of each partner.
+
+Generating a word cloud runs a layout algorithm that takes a noticeable amount
+of time, so the rendered PNG images are cached in memory (LRU) and on disk. The
+cache key contains the content hash of partner_data.csv, so a new snapshot gets
+new word clouds. Run this module to pre-render the word clouds of all partners
+(this is done while building the Docker image).
+"""
+import hashlib
+import io
+import os
+from typing import Optional
+
+import streamlit as st
+
+import snapshot
+
+CACHE_DIR = os.path.join(os.environ.get("KG_CACHE_DIR", "cache"), "wordclouds")
+
+# Number of word clouds kept in memory
+MEMORY_CACHE_SIZE = 64
+
+
+def render_wordcloud(text: str) -> bytes:
+    """Render a word cloud as PNG image."""
+    # Imported on first use: wordcloud pulls in matplotlib, which takes longer
+    # to import than the rest of the dashboard, and pre-rendered word clouds
+    # are served from the disk cache without it
+    from wordcloud import WordCloud
+
+    wordcloud = WordCloud(background_color="white", width=512, height=384).generate(
+        text
+    )
+    buffer = io.BytesIO()
+    wordcloud.to_image().save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def cache_path(partner: str, snapshot_hash: str) -> str:
+    """Get the on-disk cache file of the word cloud of a partner."""
+    key = hashlib.sha256(f"{partner}\n{snapshot_hash}".encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key[:32]}.png")
+
+
+@st.cache_resource(show_spinner=False, max_entries=MEMORY_CACHE_SIZE)
+def _partner_wordcloud(partner: str, snapshot_hash: str) -> Optional[bytes]:
+    path = cache_path(partner, snapshot_hash)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    partner_data = snapshot.get_partner_data()
+    names = partner_data.loc[partner_data["Partner"] == partner, "Name"].dropna()
+    if names.empty:
+        return None
+
+    image = render_wordcloud(" ".join(names.astype(str)))
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(image)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # The disk cache is optional (e.g. read-only file system)
+    return image
+
+
+def get_partner_wordcloud(partner: str) -> Optional[bytes]:
+    """Get the word cloud of a partner as PNG image, None if there is no data."""
+    return _partner_wordcloud(partner, snapshot.table_hash("partner_data"))
+
+
+if __name__ == "__main__":
+    for partner_name in snapshot.get_partner_info()["Name"]:
+        rendered = get_partner_wordcloud(partner_name) is not None
+        print(f"{partner_name}: {'rendered' if rendered else 'no data'}")